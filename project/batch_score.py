@@ -0,0 +1,184 @@
+"""Headless batch scoring for large project files.
+
+Streams a CSV or JSON (array or newline-delimited) project file through the same
+ESGScorer / RiskAnalyzer / PortfolioOptimizer stack used by the GUI, in
+fixed-size chunks, and appends the results to a CSV file as it goes.
+
+The models are fitted once on the first ``--reference-size`` rows of the
+input; every chunk (including the reference rows) is then scored against
+those fitted models, so memory stays bounded by the reference sample plus
+one chunk regardless of the input size.
+
+Usage:
+    python batch_score.py projects.csv scores.csv --chunk-size 50000
+"""
+import argparse
+import sys
+import time
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from models.data.constants import FEATURE_COLUMNS
+from models.data.json_stream import PROJECT_FIELDS, iter_json_frames
+from models.ml.esg_scorer import ESGScorer
+from models.ml.model_cache import ModelCache
+from models.ml.risk_analyzer import RiskAnalyzer
+from models.ml.portfolio_optimizer import PortfolioOptimizer
+
+OUTPUT_COLUMNS = [
+    'Project Name', 'ESG Score', 'Risk Score', 'Environmental Risk',
+    'Financial Risk', 'Expected Return', 'Risk'
+]
+
+
+class BatchScorer:
+    def __init__(self, chunk_size=50000, reference_size=100000, seed=42,
+                 cache=None, model_key=None, n_jobs=None, covariance='mcd', profile=None):
+        self.chunk_size = chunk_size
+        self.reference_size = reference_size
+        self.seed = seed
+        self.model_key = model_key
+        self.esg_scorer = ESGScorer(cache=cache, n_jobs=n_jobs, profile=profile)
+        self.risk_analyzer = RiskAnalyzer(covariance=covariance, n_jobs=n_jobs)
+        self.portfolio_optimizer = PortfolioOptimizer()
+
+    def read_chunks(self, file_path):
+        """Yield DataFrame chunks holding only the columns needed for scoring"""
+        wanted = set(FEATURE_COLUMNS) | {'Project Name'}
+        suffix = Path(file_path).suffix.lower()
+
+        if suffix == '.csv':
+            reader = pd.read_csv(
+                file_path, chunksize=self.chunk_size,
+                usecols=lambda column: column in wanted
+            )
+        elif suffix in ('.json', '.jsonl', '.ndjson'):
+            # JSON arrays and NDJSON are both decoded record by record
+            reader = iter_json_frames(file_path, PROJECT_FIELDS, self.chunk_size)
+        else:
+            raise ValueError(f"Unsupported input format: {suffix}")
+
+        for chunk in reader:
+            missing = set(FEATURE_COLUMNS) - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Missing columns: {sorted(missing)}")
+            yield chunk[[column for column in chunk.columns if column in wanted]]
+
+    def fit(self, reference):
+        """Fit all models on a reference sample of projects"""
+        if self.model_key is not None:
+            # Predict-only: reuse a previously cached ensemble and its scaler
+            if not self.esg_scorer.load_models(self.model_key):
+                raise ValueError(f"Model {self.model_key} not found in cache")
+        else:
+            X = self.esg_scorer.prepare_features(reference)
+            # Sample target for training, as in ProjectEvaluator.evaluate_projects
+            y = np.random.default_rng(self.seed).random(len(reference))
+            self.model_key = self.esg_scorer.train_models(X, y)
+        self.risk_analyzer.fit(reference)
+        self.portfolio_optimizer.calculate_expected_returns(reference)
+        self.portfolio_optimizer.calculate_risks(reference)
+
+    def score_chunk(self, chunk):
+        """Score one chunk against the already fitted models"""
+        X = self.esg_scorer.prepare_features(chunk, fit=False)
+        risk_metrics = self.risk_analyzer.score(chunk)
+
+        if 'Project Name' in chunk.columns:
+            names = chunk['Project Name'].to_numpy()
+        else:
+            names = np.full(len(chunk), '', dtype=object)
+
+        return pd.DataFrame({
+            'Project Name': names,
+            'ESG Score': self.esg_scorer.predict_ensemble(X),
+            'Risk Score': risk_metrics['risk_score'],
+            'Environmental Risk': risk_metrics['env_risk'],
+            'Financial Risk': risk_metrics['fin_risk'],
+            'Expected Return': self.portfolio_optimizer.calculate_expected_returns(chunk, fit=False),
+            'Risk': self.portfolio_optimizer.calculate_risks(chunk, fit=False)
+        }, columns=OUTPUT_COLUMNS)
+
+    def run(self, input_path, output_path, progress=None):
+        """Score every project in input_path and write the results to output_path"""
+        chunks = iter(self.read_chunks(input_path))
+
+        # Buffer just enough leading chunks to fit the models
+        reference_chunks = []
+        n_reference = 0
+        for chunk in chunks:
+            reference_chunks.append(chunk)
+            n_reference += len(chunk)
+            if n_reference >= self.reference_size:
+                break
+        if not reference_chunks:
+            raise ValueError(f"No projects found in {input_path}")
+
+        self.fit(pd.concat(reference_chunks, ignore_index=True).iloc[:self.reference_size])
+
+        n_scored = 0
+        with open(output_path, 'w', newline='') as output:
+            for i, chunk in enumerate(chain(reference_chunks, chunks)):
+                if i < len(reference_chunks):
+                    reference_chunks[i] = None  # release as we go
+                self.score_chunk(chunk).to_csv(output, header=(i == 0), index=False)
+                n_scored += len(chunk)
+                if progress is not None:
+                    progress(n_scored)
+        return n_scored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score ESG projects without the GUI")
+    parser.add_argument('input', help="CSV or JSON (array or newline-delimited) project file")
+    parser.add_argument('output', help="CSV file to write scores to")
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                        help="projects scored per chunk (default: 50000)")
+    parser.add_argument('--reference-size', type=int, default=100000,
+                        help="leading projects used to fit the models (default: 100000)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help="worker processes for the ESG ensemble (default: all cores)")
+    parser.add_argument('--cache-dir', help="directory for cached fitted models")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always refit and do not store the fitted models")
+    parser.add_argument('--model-key',
+                        help="score with a cached ESG model instead of fitting one")
+    parser.add_argument('--covariance', choices=['mcd', 'empirical'], default='mcd',
+                        help="elliptic risk detector: robust MCD or the faster empirical "
+                             "covariance (default: mcd)")
+    parser.add_argument('--profile', choices=['auto', 'classic', 'large'],
+                        help="ESG model backend; 'auto' picks 'large' for big reference "
+                             "samples (default: GFAI_ESG_PROFILE or auto)")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else ModelCache(args.cache_dir)
+    if args.model_key and cache is None:
+        parser.error("--model-key requires the model cache")
+    scorer = BatchScorer(args.chunk_size, args.reference_size, args.seed,
+                         cache=cache, model_key=args.model_key, n_jobs=args.jobs,
+                         covariance=args.covariance, profile=args.profile)
+    start = time.perf_counter()
+
+    def report(n_scored):
+        elapsed = time.perf_counter() - start
+        print(f"Scored {n_scored:,} projects ({n_scored / elapsed:,.0f}/s)",
+              file=sys.stderr)
+
+    try:
+        n_scored = scorer.run(args.input, args.output, progress=report)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {n_scored:,} scores to {args.output}", file=sys.stderr)
+    if scorer.model_key:
+        print(f"ESG model key: {scorer.model_key}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Accuracy/throughput trade-off of the ESGScorer model profiles.
+
+Trains each profile on synthetic projects whose target is the weighted
+ESG score of the normalised metrics plus an interaction term and noise,
+so there is something to learn. For every training size it reports fit
+time, prediction throughput and R^2 on held-out projects for each
+ensemble member and for the ensemble. The classic profile is skipped
+above --classic-max-size, where it takes hours.
+
+Usage (from the project directory):
+    python -m benchmarks.esg_profiles --sizes 10000 100000 1000000 --output profiles.json
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import r2_score
+
+from models.data.constants import ESG_WEIGHTS
+from models.data.data_utils import calculate_weighted_score, normalize_data
+from models.data.synthetic import SyntheticProjectGenerator
+from models.ml.esg_scorer import ESGScorer
+from .run_benchmarks import environment
+
+DEFAULT_SIZES = [10000, 100000]
+# Held-out projects scored for every size
+TEST_SIZE = 50000
+
+
+def learnable_target(data, seed=42):
+    normalized = normalize_data(data, list(ESG_WEIGHTS))
+    score = calculate_weighted_score(normalized).to_numpy()
+    # An interaction the per-metric weights cannot express
+    interaction = normalized['CO2 Reduction'].to_numpy() * normalized['Governance Score'].to_numpy()
+    noise = np.random.default_rng(seed).normal(0.0, 0.02, len(data))
+    return score + 0.3 * interaction + noise
+
+
+def evaluate_profile(profile, train, y_train, test, y_test, n_jobs=-1):
+    scorer = ESGScorer(n_jobs=n_jobs, profile=profile)
+    start = time.perf_counter()
+    scorer.train_models(scorer.prepare_features(train), y_train)
+    fit_seconds = time.perf_counter() - start
+
+    X_test = scorer.prepare_features(test, fit=False)
+    start = time.perf_counter()
+    prediction = scorer.predict_ensemble(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'profile': profile,
+        'n': len(train),
+        'fit_seconds': fit_seconds,
+        'predict_rows_per_second': len(test) / predict_seconds,
+        'r2': r2_score(y_test, prediction),
+        'member_r2': {
+            name: r2_score(y_test, model.predict(X_test))
+            for name, model in zip(('rf', 'gb', 'nn'), scorer.models())
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the ESGScorer model profiles")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="training project counts")
+    parser.add_argument('--profiles', nargs='+', choices=['classic', 'large'],
+                        default=['classic', 'large'])
+    parser.add_argument('--classic-max-size', type=int, default=200000,
+                        help="skip the classic profile above this size (default: 200000)")
+    parser.add_argument('--jobs', type=int, default=-1)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticProjectGenerator(seed=42)
+    test = generator.generate(TEST_SIZE)
+    y_test = learnable_target(test, seed=0)
+
+    results = []
+    for n in sorted(args.sizes):
+        # Training rows follow the held-out block in the same stream
+        train = generator.generate(n, start=TEST_SIZE)
+        y_train = learnable_target(train, seed=n)
+        for profile in args.profiles:
+            if profile == 'classic' and n > args.classic_max_size:
+                continue
+            entry = evaluate_profile(profile, train, y_train, test, y_test, args.jobs)
+            results.append(entry)
+            members = ' '.join(f"{name}={r2:.3f}" for name, r2 in entry['member_r2'].items())
+            print(f"{profile:8s} {n:>10,} fit {entry['fit_seconds']:9.2f} s  "
+                  f"predict {entry['predict_rows_per_second']:>12,.0f} rows/s  "
+                  f"R2 {entry['r2']:.4f} ({members})", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Benchmarks for the evaluation pipeline at increasing project counts.
+
+Times model training and prediction (classic and large ESG model
+profiles), risk analysis, portfolio optimisation, CSV/JSON ingestion and
+project save/load on synthetic projects. Each benchmark records the best
+wall time over --repeat runs and the peak traced memory of one extra run,
+and the results are written as JSON. Given --baseline, every (benchmark,
+size) pair is compared with a previous results file and the run fails if
+anything slowed down by more than --tolerance.
+
+Usage (from the project directory):
+    python -m benchmarks.run_benchmarks --sizes 10 1000 100000 --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --only esg_predict
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from models.data.json_stream import read_json_columns
+from models.data.project_store import load_project_file, save_project_file
+from models.data.synthetic import SyntheticProjectGenerator
+from models.ml.esg_scorer import ESGScorer
+from models.ml.portfolio_optimizer import PortfolioOptimizer
+from models.ml.risk_analyzer import RiskAnalyzer
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000, 1000000]
+
+
+def training_target(n):
+    return np.random.default_rng(42).random(n)
+
+
+# Each benchmark does its untimed setup and returns the callable to time
+
+def esg_train(data, workdir, profile='classic'):
+    y = training_target(len(data))
+
+    def run():
+        scorer = ESGScorer(n_jobs=-1, profile=profile)
+        scorer.train_models(scorer.prepare_features(data), y)
+    return run
+
+
+def esg_predict(data, workdir, profile='classic'):
+    scorer = ESGScorer(n_jobs=-1, profile=profile)
+    sample = data.iloc[:10000]
+    scorer.train_models(scorer.prepare_features(sample), training_target(len(sample)))
+    return lambda: scorer.predict_ensemble(scorer.prepare_features(data, fit=False))
+
+
+def esg_train_large(data, workdir):
+    return esg_train(data, workdir, profile='large')
+
+
+def esg_predict_large(data, workdir):
+    return esg_predict(data, workdir, profile='large')
+
+
+def risk_analyze(data, workdir):
+    return lambda: RiskAnalyzer(n_jobs=-1).analyze_risks(data)
+
+
+def portfolio_optimize(data, workdir):
+    return lambda: PortfolioOptimizer().optimize(data)
+
+
+def csv_ingest(data, workdir):
+    path = Path(workdir) / 'projects.csv'
+    data.to_csv(path, index=False)
+    return lambda: pd.read_csv(path)
+
+
+def json_ingest(data, workdir):
+    path = Path(workdir) / 'projects.json'
+    data.to_json(path, orient='records')
+    return lambda: read_json_columns(path)
+
+
+def project_save(data, workdir):
+    path = Path(workdir) / 'save.gfp'
+    return lambda: save_project_file(path, data, {'risk_tolerance': 0.5})
+
+
+def project_load(data, workdir):
+    path = Path(workdir) / 'load.gfp'
+    save_project_file(path, data)
+    return lambda: load_project_file(path, mmap=False)
+
+
+# name -> (setup function, largest project count worth running it at)
+BENCHMARKS = {
+    'esg_train': (esg_train, 100000),
+    'esg_predict': (esg_predict, None),
+    'esg_train_large': (esg_train_large, None),
+    'esg_predict_large': (esg_predict_large, None),
+    'risk_analyze': (risk_analyze, None),
+    'portfolio_optimize': (portfolio_optimize, None),
+    'csv_ingest': (csv_ingest, None),
+    'json_ingest': (json_ingest, None),
+    'project_save': (project_save, None),
+    'project_load': (project_load, None)
+}
+
+
+def measure(run, repeat, memory=True):
+    """Return (best wall time in seconds, peak traced MB or None)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        # Separate run: tracing slows allocation-heavy code down
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+def run_suite(names, sizes, repeat=3, memory=True, max_size=None):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            data = SyntheticProjectGenerator(seed=42).generate(n)
+            for name in names:
+                setup, limit = BENCHMARKS[name]
+                if (limit is not None and n > limit) or (max_size is not None and n > max_size):
+                    continue
+                seconds, peak = measure(setup(data, workdir), repeat, memory)
+                results.append({'name': name, 'n': n, 'seconds': seconds, 'peak_mb': peak})
+                peak_text = f"{peak:10.1f} MB" if peak is not None else ""
+                print(f"{name:20s} {n:>10,} {seconds:10.4f} s {peak_text}", file=sys.stderr)
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def compare(results, baseline, tolerance, min_seconds=0.01):
+    """Print time ratios against baseline; returns the regressed entries.
+
+    Runs shorter than min_seconds are reported but never flagged, since
+    timer noise dominates them.
+    """
+    previous = {(entry['name'], entry['n']): entry for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry['name'], entry['n']))
+        if old is None:
+            continue
+        ratio = entry['seconds'] / old['seconds'] if old['seconds'] > 0 else float('inf')
+        flag = ''
+        if ratio > tolerance and entry['seconds'] >= min_seconds:
+            flag = '  REGRESSION'
+            regressions.append(entry)
+        print(f"{entry['name']:20s} {entry['n']:>10,} {old['seconds']:10.4f} s -> "
+              f"{entry['seconds']:10.4f} s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ESG evaluation pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="project counts to benchmark")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS),
+                        help="run just these benchmarks")
+    parser.add_argument('--max-size', type=int,
+                        help="skip sizes above this for every benchmark")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per benchmark; the best is kept (default: 3)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the traced peak-memory run")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.2,
+                        help="slowdown ratio counted as a regression (default: 1.2)")
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help="never flag runs faster than this (default: 0.01)")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    results = run_suite(names, sorted(args.sizes), args.repeat,
+                        not args.no_memory, args.max_size)
+    report = {'environment': environment(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than x{args.tolerance}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
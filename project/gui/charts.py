@@ -0,0 +1,93 @@
+import numpy as np
+from PyQt6.QtCore import QSettings
+
+# Above this many projects bar charts show one bar per group of projects
+MAX_BARS = 300
+# Most category labels drawn along an axis
+MAX_TICK_LABELS = 25
+# Scatter plots with more points than this are drawn as a density image
+DENSITY_THRESHOLD = 50000
+# Screen pixels per density bin along each axis
+DENSITY_BIN_PIXELS = 3
+
+
+def chart_setting(key, default):
+    """Integer chart option from the application settings"""
+    return QSettings('GreenFinanceAI', 'Platform').value(key, default, type=int)
+
+
+def aggregate_bars(values, max_bars):
+    """Group consecutive values into at most max_bars bars.
+
+    Returns (heights, starts): the mean of each group and the index of
+    its first value. Without grouping starts is simply 0..n-1.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= max_bars:
+        return values, np.arange(n)
+    starts = np.linspace(0, n, max_bars, endpoint=False).astype(np.int64)
+    sizes = np.diff(np.append(starts, n))
+    return np.add.reduceat(values, starts) / sizes, starts
+
+
+def thin_ticks(count, max_labels=MAX_TICK_LABELS):
+    """Evenly spaced positions for at most max_labels of count categories"""
+    if count <= max_labels:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, max_labels).round().astype(np.int64))
+
+
+def density_grid(x, y, xlim, ylim, shape):
+    """Point counts on a (rows, columns) grid of equal bins spanning xlim by ylim.
+
+    Bin indices come straight from arithmetic plus one bincount, so the
+    cost is linear in the points and independent of the bin count.
+    """
+    rows, columns = shape
+    (x0, x1), (y0, y1) = xlim, ylim
+    inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    column = ((x[inside] - x0) * (columns / (x1 - x0))).astype(np.int64)
+    row = ((y[inside] - y0) * (rows / (y1 - y0))).astype(np.int64)
+    # Points on the upper edges belong to the last bin
+    np.minimum(column, columns - 1, out=column)
+    np.minimum(row, rows - 1, out=row)
+    return np.bincount(row * columns + column, minlength=rows * columns).reshape(rows, columns)
+
+
+class BlitManager:
+    """Redraws a few animated artists over a cached background.
+
+    A full draw (canvas.draw_idle) stores the static part of the figure;
+    update() then restores that image and repaints only the animated
+    artists, which is much cheaper than redrawing every artist.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        canvas.mpl_connect('draw_event', self.on_draw)
+
+    def set_artists(self, artists):
+        for artist in artists:
+            artist.set_animated(True)
+        self.artists = list(artists)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        if self.background is None:
+            # Nothing cached yet; the next full draw paints everything
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
@@ -0,0 +1,66 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+    QCheckBox, QFileDialog, QMessageBox)
+from models.instrumentation import tracer
+from .table_model import ColumnTableModel, create_table_view
+
+STAT_COLUMNS = ('count', 'last', 'mean', 'p50', 'p95', 'max')
+
+
+class DiagnosticsDialog(QDialog):
+    """Per-stage timings recorded by the tracer, with Chrome trace export"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(700, 420)
+        layout = QVBoxLayout(self)
+
+        self.enabled_check = QCheckBox("Enable tracing")
+        self.enabled_check.setChecked(tracer.enabled)
+        self.enabled_check.toggled.connect(self.set_enabled)
+        layout.addWidget(self.enabled_check)
+
+        self.table_model = ColumnTableModel(self)
+        layout.addWidget(create_table_view(self.table_model, self))
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_btn)
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear)
+        buttons.addWidget(clear_btn)
+        export_btn = QPushButton("Export Chrome Trace...")
+        export_btn.clicked.connect(self.export_trace)
+        buttons.addWidget(export_btn)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def set_enabled(self, enabled):
+        tracer.enabled = enabled
+
+    def refresh(self):
+        stats = tracer.stats()
+        stages = sorted(stats)
+        columns = {"Stage": stages, "Count": [stats[stage]['count'] for stage in stages]}
+        for name in STAT_COLUMNS[1:]:
+            # Seconds shown as milliseconds
+            columns[f"{name.capitalize()} (ms)"] = [1000 * stats[stage][name] for stage in stages]
+        formats = {header: '{:.2f}' for header in columns if header.endswith('(ms)')}
+        self.table_model.set_columns(columns, formats)
+
+    def clear(self):
+        tracer.clear()
+        self.refresh()
+
+    def export_trace(self):
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Export Chrome Trace", "", "Trace Files (*.json)"
+        )
+        if file_name:
+            try:
+                count = tracer.export_chrome_trace(file_name)
+                QMessageBox.information(self, "Success", f"Exported {count} trace events")
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to export trace: {str(e)}")
@@ -0,0 +1,130 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+
+class JobSignals(QObject):
+    progress = pyqtSignal(str, int, str)
+    finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+
+
+class Job(QRunnable):
+    """Runs fn(progress) on a pool thread.
+
+    fn reports stage-level progress by calling progress(percent, message);
+    the call raises JobCancelled once cancel() has been requested, which
+    is how long pipelines stop between stages.
+    """
+
+    def __init__(self, name, fn):
+        super().__init__()
+        self.name = name
+        self.fn = fn
+        self.signals = JobSignals()
+        self.cancel_requested = False
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def report(self, percent, message):
+        if self.cancel_requested:
+            raise JobCancelled()
+        self.signals.progress.emit(self.name, int(percent), message)
+
+    def run(self):
+        try:
+            self.report(0, f"{self.name}...")
+            result = self.fn(self.report)
+        except JobCancelled:
+            self.signals.cancelled.emit(self.name)
+        except Exception as e:
+            self.signals.failed.emit(self.name, str(e))
+        else:
+            self.signals.finished.emit(self.name, result)
+
+
+class JobRunner(QObject):
+    """Runs evaluator pipelines off the GUI thread, one at a time.
+
+    Jobs are keyed by name: submitting a name that is already queued or
+    running adds the callbacks to the in-flight job instead of starting a
+    second one, so repeated clicks cost nothing. A single worker thread
+    keeps pipelines from touching the shared ProjectEvaluator concurrently.
+    """
+
+    progress = pyqtSignal(int, str)
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.jobs = {}
+        self.callbacks = {}
+
+    def is_busy(self):
+        return bool(self.jobs)
+
+    def submit(self, name, fn, on_done=None, on_error=None):
+        """Queue fn(progress) under name; returns False if merged into a running job"""
+        self.callbacks.setdefault(name, []).append((on_done, on_error))
+        if name in self.jobs:
+            return False
+
+        job = Job(name, fn)
+        job.signals.progress.connect(self._on_progress)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+        self.jobs[name] = job
+        if len(self.jobs) == 1:
+            self.busy_changed.emit(True)
+        self.pool.start(job)
+        return True
+
+    def cancel(self, name=None):
+        """Cancel one job, or every queued and running job when name is None"""
+        names = [name] if name is not None else list(self.jobs)
+        for job_name in names:
+            job = self.jobs.get(job_name)
+            if job is None:
+                continue
+            job.cancel()
+            try:
+                taken = self.pool.tryTake(job)
+            except RuntimeError:
+                # Already run and deleted by the pool; its signal is pending
+                taken = False
+            if taken:
+                # Never started, so no worker will report back
+                self._on_cancelled(job_name)
+
+    def _on_progress(self, name, percent, message):
+        self.progress.emit(percent, message)
+
+    def _finish(self, name):
+        self.jobs.pop(name, None)
+        callbacks = self.callbacks.pop(name, [])
+        if not self.jobs:
+            self.busy_changed.emit(False)
+        return callbacks
+
+    def _on_finished(self, name, result):
+        self.progress.emit(100, f"{name} finished")
+        for on_done, _ in self._finish(name):
+            if on_done is not None:
+                on_done(result)
+
+    def _on_failed(self, name, message):
+        self.progress.emit(0, f"{name} failed: {message}")
+        for _, on_error in self._finish(name):
+            if on_error is not None:
+                on_error(message)
+
+    def _on_cancelled(self, name):
+        self.progress.emit(0, f"{name} cancelled")
+        self._finish(name)
@@ -0,0 +1,29 @@
+from PyQt6.QtWidgets import QVBoxLayout, QWidget
+
+
+class LazyTab(QWidget):
+    """Tab page that builds its real widget the first time it is shown.
+
+    factory() is called at most once; keeping the import of heavy tab
+    modules (matplotlib) inside it defers that cost to first activation.
+    """
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        self.page_layout = QVBoxLayout(self)
+        self.page_layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self):
+        return self.widget is not None
+
+    def build(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.page_layout.addWidget(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        self.build()
+        super().showEvent(event)
@@ -7,13 +7,17 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer, QSettings, QSize
 from PyQt6.QtGui import QAction, QIcon, QPalette, QColor, QFont
-import json
 import pandas as pd
 from pathlib import Path
 from .tabs.project_scoring_tab import ProjectScoringTab
-from .tabs.portfolio_optimization_tab import PortfolioOptimizationTab
-from .tabs.risk_analysis_tab import RiskAnalysisTab
+from .job_runner import JobRunner
+from .charts import DENSITY_THRESHOLD, MAX_BARS
+from .lazy_tab import LazyTab
+from models.data.constants import WORKSPACE_MEMORY_BUDGET
 from models.project_evaluator import ProjectEvaluator
+from models.workspace import Workspace
+from models.data.autosave import ProjectAutosaver, autosave_path, replay_journal
+from models.data.project_store import load_project_file, PROJECT_SUFFIX
 
 class ThemeManager:
    @staticmethod
@@ -199,6 +203,27 @@ class SettingsDialog(QDialog):
         self.autosave_interval.setValue(self.settings.value('autosave_interval', 5, type=int))
         layout.addRow("Auto-save interval (minutes):", self.autosave_interval)
 
+        # Chart detail
+        self.chart_max_bars = QSpinBox()
+        self.chart_max_bars.setRange(10, 5000)
+        self.chart_max_bars.setValue(self.settings.value('chart_max_bars', MAX_BARS, type=int))
+        layout.addRow("Max bars per chart:", self.chart_max_bars)
+
+        self.chart_density_threshold = QSpinBox()
+        self.chart_density_threshold.setRange(1000, 100000000)
+        self.chart_density_threshold.setSingleStep(10000)
+        self.chart_density_threshold.setValue(
+            self.settings.value('chart_density_threshold', DENSITY_THRESHOLD, type=int))
+        layout.addRow("Density plot above (points):", self.chart_density_threshold)
+
+        # Workspace memory before idle datasets are spilled to disk
+        self.workspace_budget = QSpinBox()
+        self.workspace_budget.setRange(64, 1024 * 1024)
+        self.workspace_budget.setSingleStep(256)
+        self.workspace_budget.setValue(self.settings.value(
+            'workspace_budget_mb', WORKSPACE_MEMORY_BUDGET // 1024 ** 2, type=int))
+        layout.addRow("Workspace memory (MB):", self.workspace_budget)
+
         # API Settings
         self.api_key = QLineEdit()
         self.api_key.setText(self.settings.value('api_key', ''))
@@ -213,10 +238,15 @@ class SettingsDialog(QDialog):
         self.settings.setValue('theme', self.theme_combo.currentText())
         self.settings.setValue('autosave', self.autosave_check.isChecked())
         self.settings.setValue('autosave_interval', self.autosave_interval.value())
+        self.settings.setValue('chart_max_bars', self.chart_max_bars.value())
+        self.settings.setValue('chart_density_threshold', self.chart_density_threshold.value())
+        self.settings.setValue('workspace_budget_mb', self.workspace_budget.value())
         self.settings.setValue('api_key', self.api_key.text())
         
-        # Apply theme
+        # Apply theme and workspace budget
         self.parent.apply_theme(self.theme_combo.currentText())
+        self.parent.workspace.memory_budget = self.workspace_budget.value() * 1024 ** 2
+        self.parent.workspace.enforce_budget()
         self.accept()
 
 class MainWindow(QMainWindow):
@@ -228,6 +258,10 @@ class MainWindow(QMainWindow):
         # Initialize settings
         self.settings = QSettings('GreenFinanceAI', 'Platform')
         self.project_evaluator = ProjectEvaluator()
+        self.job_runner = JobRunner(self)
+        self.autosaver = ProjectAutosaver()
+        # Opened and imported datasets, with their scores, kept side by side
+        self.workspace = Workspace(self.project_evaluator, self.workspace_budget())
         self.current_project_file = None
         self.unsaved_changes = False
         
@@ -249,27 +283,6 @@ class MainWindow(QMainWindow):
         # Show welcome message
         self.show_welcome_message()
 
-    def setup_ui(self):
-        """Setup the main UI components"""
-        # Create central widget
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        
-        # Create main layout
-        main_layout = QVBoxLayout(central_widget)
-        
-        # Initialize tab widget
-        self.tab_widget = QTabWidget()
-        self.project_scoring_tab = ProjectScoringTab(self.project_evaluator)
-        self.portfolio_tab = PortfolioOptimizationTab(self.project_evaluator)
-        self.risk_tab = RiskAnalysisTab(self.project_evaluator)
-
-        self.tab_widget.addTab(self.project_scoring_tab, "Project Scoring")
-        self.tab_widget.addTab(self.portfolio_tab, "Portfolio Optimization")
-        self.tab_widget.addTab(self.risk_tab, "Risk Analysis")
-
-        main_layout.addWidget(self.tab_widget)
-
     def apply_theme(self, theme_name):
         """Apply selected theme"""
         if theme_name == "Dark":
@@ -378,10 +391,16 @@ class MainWindow(QMainWindow):
             self.autosave_timer.start(interval * 60 * 1000)  # Convert minutes to milliseconds
 
     def auto_save(self):
-        """Auto-save current project"""
+        """Queue a background auto-save of the current project"""
+        error = self.autosaver.take_error()
+        if error is not None:
+            self.unsaved_changes = True
+            self.status_bar.showMessage(f"Auto-save failed: {error}", 5000)
         if self.current_project_file and self.unsaved_changes:
-            self.save_project(self.current_project_file)
-            self.status_bar.showMessage("Project auto-saved", 3000)
+            self.autosaver.submit(self.current_project_file, self.project_evaluator.get_data(),
+                                  self.project_settings())
+            self.unsaved_changes = False
+            self.status_bar.showMessage("Auto-saving project", 3000)
     def apply_theme(self, theme_name):
         """Apply selected theme"""
         if theme_name == "Dark":
@@ -410,6 +429,8 @@ class MainWindow(QMainWindow):
 
     def open_project(self):
         """Open existing project"""
+        if self.busy_for_datasets("opening a project"):
+            return
         if self.unsaved_changes:
             reply = QMessageBox.question(self, 'Unsaved Changes',
                 'Do you want to save your changes before opening another project?',
@@ -423,12 +444,13 @@ class MainWindow(QMainWindow):
                 return
 
         file_name, _ = QFileDialog.getOpenFileName(
-            self, "Open Project", "", "Project Files (*.json *.csv)"
+            self, "Open Project", "", "Project Files (*.gfp *.json *.csv)"
         )
         if file_name:
             try:
                 self.load_project(file_name)
-                self.current_project_file = file_name
+                # Legacy JSON/CSV projects are saved, and auto-saved, as a .gfp next to them
+                self.current_project_file = autosave_path(file_name)
                 self.unsaved_changes = False
                 self.status_bar.showMessage(f"Opened project: {file_name}")
             except Exception as e:
@@ -438,14 +460,18 @@ class MainWindow(QMainWindow):
         """Save current project"""
         if not file_name and not self.current_project_file:
             file_name, _ = QFileDialog.getSaveFileName(
-                self, "Save Project", "", "Project Files (*.json)"
+                self, "Save Project", "", "Project Files (*.gfp)"
             )
         
         if file_name or self.current_project_file:
             try:
                 save_path = file_name or self.current_project_file
+                # Legacy JSON/CSV projects are saved next to the original in the columnar format
+                save_path = str(Path(save_path).with_suffix(PROJECT_SUFFIX))
                 self.export_project_data(save_path)
                 self.current_project_file = save_path
+                if self.workspace.active is not None:
+                    self.workspace.set_source(self.workspace.active, save_path)
                 self.unsaved_changes = False
                 self.status_bar.showMessage(f"Project saved to: {save_path}")
             except Exception as e:
@@ -453,6 +479,8 @@ class MainWindow(QMainWindow):
 
     def import_data(self):
         """Import data from external file"""
+        if self.busy_for_datasets("importing data"):
+            return
         file_name, _ = QFileDialog.getOpenFileName(
             self, "Import Data", "", "Data Files (*.csv *.xlsx)"
         )
@@ -463,7 +491,7 @@ class MainWindow(QMainWindow):
                 else:
                     data = pd.read_excel(file_name)
                 
-                self.project_evaluator.set_data(data)
+                self.add_dataset(Path(file_name).stem, data)
                 self.update_ui_with_data()
                 self.unsaved_changes = True
                 self.status_bar.showMessage(f"Data imported from: {file_name}")
@@ -492,6 +520,12 @@ class MainWindow(QMainWindow):
         dialog = SettingsDialog(self)
         dialog.exec()
 
+    def show_diagnostics(self):
+        """Show per-stage timings and trace export"""
+        from .diagnostics_dialog import DiagnosticsDialog
+        dialog = DiagnosticsDialog(self)
+        dialog.exec()
+
     def show_help(self):
         """Show help documentation"""
         help_text = """
@@ -538,15 +572,15 @@ class MainWindow(QMainWindow):
     def update_ui_for_new_project(self):
         """Update UI elements for new project"""
         
-        self.portfolio_tab.reset()
-        self.risk_tab.reset()
+        # Tabs never opened have nothing to reset
+        for page in (self.portfolio_page, self.risk_page):
+            if page.is_built():
+                page.widget.reset()
         self.update_header_stats()
 
     def update_ui_with_data(self):
         """Update UI elements with new data"""
-        self.project_scoring_tab.update_data()
-        self.portfolio_tab.update_data()
-        self.risk_tab.update_data()
+        self.project_scoring_tab.update_table()
         self.update_header_stats()
 
     def update_header_stats(self):
@@ -554,26 +588,89 @@ class MainWindow(QMainWindow):
         stats = self.project_evaluator.get_summary_stats()
         # Update stats in header (implement based on your header structure)
 
+    def project_settings(self):
+        return {
+            'autosave': self.settings.value('autosave'),
+            'theme': self.settings.value('theme')
+        }
+
     def export_project_data(self, file_path):
         """Export project data to file"""
-        data = {
-            'project_data': self.project_evaluator.get_data().to_dict(),
-            'settings': {
-                'autosave': self.settings.value('autosave'),
-                'theme': self.settings.value('theme')
-            }
-        }
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=4)
+        # A full checkpoint; also resets the auto-save journal
+        self.autosaver.save(file_path, self.project_evaluator.get_data(), self.project_settings())
+
+    def workspace_budget(self):
+        default = WORKSPACE_MEMORY_BUDGET // 1024 ** 2
+        return self.settings.value('workspace_budget_mb', default, type=int) * 1024 ** 2
+
+    def add_dataset(self, name, data, source=None):
+        """Add data to the workspace under a unique name and switch to it.
+
+        source is kept as the .gfp project the dataset saves to, so switching
+        back never points the auto-saver at a legacy JSON/CSV file.
+        """
+        if source is not None:
+            source = autosave_path(source)
+        if self.workspace.active is None and self.project_evaluator.has_data():
+            # Keep projects loaded before the first dataset was opened
+            self.workspace.add(self.workspace.unique_name("Projects"),
+                               self.project_evaluator.get_data(), activate=False)
+        name = self.workspace.unique_name(name)
+        self.workspace.add(name, data, source)
+        self.current_project_file = source
+        self.refresh_dataset_list()
+        self.update_ui_for_new_project()
+
+    def busy_for_datasets(self, action):
+        """True, with a status message, while a job may still be reading the active dataset"""
+        if not self.job_runner.is_busy():
+            return False
+        self.status_bar.showMessage(f"Wait for the running analysis before {action}", 5000)
+        return True
+
+    def refresh_dataset_list(self):
+        self.dataset_combo.blockSignals(True)
+        self.dataset_combo.clear()
+        self.dataset_combo.addItems(self.workspace.names())
+        self.dataset_combo.setCurrentText(self.workspace.active or "")
+        self.dataset_combo.blockSignals(False)
+
+    def switch_dataset(self, name):
+        """Swap in another workspace dataset along with its computed results"""
+        if not name or name == self.workspace.active:
+            return
+        if self.busy_for_datasets("switching datasets"):
+            self.refresh_dataset_list()
+            return
+        # Queue the outgoing dataset's changes before the auto-saver follows the new one
+        self.auto_save()
+        data = self.workspace.activate(name)
+        self.current_project_file = self.workspace.source(name)
+        if self.current_project_file:
+            self.autosaver.track(self.current_project_file, data, {})
+        self.refresh_dataset_list()
+        self.update_ui_for_new_project()
+        self.update_ui_with_data()
+        self.status_bar.showMessage(f"Switched to dataset: {name}", 3000)
 
     def load_project(self, file_path):
         """Load project data from file"""
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-            self.project_evaluator.set_data(pd.DataFrame(data['project_data']))
-            self.apply_theme(data['settings']['theme'])
-            self.setup_autosave()
-            self.update_ui_with_data()
+        data, settings = load_project_file(file_path)
+        # Changes auto-saved after the last checkpoint (e.g. before a crash);
+        # journals only ever sit next to the .gfp project
+        project_path = autosave_path(file_path)
+        data, replayed = replay_journal(project_path, data, settings)
+        self.autosaver.track(project_path, data, settings, replayed)
+        self.add_dataset(Path(file_path).stem, data, project_path)
+        self.apply_theme(settings.get('theme'))
+        self.setup_autosave()
+        self.update_ui_with_data()
+        if replayed:
+            QMessageBox.information(
+                self, "Recovered Changes",
+                f"Recovered {replayed} auto-saved change(s) that were not in the last save of "
+                f"{project_path}. Save the project to keep them in the project file."
+            )
 
     def setup_ui(self):
         """Setup the main UI components"""
@@ -582,17 +679,34 @@ class MainWindow(QMainWindow):
 
         # Initialize tab widget
         self.tab_widget = QTabWidget(self)
-        self.project_scoring_tab = ProjectScoringTab(self.project_evaluator)
-        self.portfolio_tab = PortfolioOptimizationTab(self.project_evaluator)
-        self.risk_tab = RiskAnalysisTab(self.project_evaluator)
+        self.project_scoring_tab = ProjectScoringTab(self.project_evaluator, self.job_runner)
+        # The chart tabs import matplotlib, so they are built on first activation
+        self.portfolio_page = LazyTab(self.create_portfolio_tab)
+        self.risk_page = LazyTab(self.create_risk_tab)
 
         self.tab_widget.addTab(self.project_scoring_tab, "Project Scoring")
-        self.tab_widget.addTab(self.portfolio_tab, "Portfolio Optimization")
-        self.tab_widget.addTab(self.risk_tab, "Risk Analysis")
+        self.tab_widget.addTab(self.portfolio_page, "Portfolio Optimization")
+        self.tab_widget.addTab(self.risk_page, "Risk Analysis")
 
         layout.addWidget(self.tab_widget)
         self.setCentralWidget(central_widget)
 
+    def create_portfolio_tab(self):
+        from .tabs.portfolio_optimization_tab import PortfolioOptimizationTab
+        return PortfolioOptimizationTab(self.project_evaluator, self.job_runner)
+
+    def create_risk_tab(self):
+        from .tabs.risk_analysis_tab import RiskAnalysisTab
+        return RiskAnalysisTab(self.project_evaluator, self.job_runner)
+
+    @property
+    def portfolio_tab(self):
+        return self.portfolio_page.build()
+
+    @property
+    def risk_tab(self):
+        return self.risk_page.build()
+
     def setup_menubar(self):
         """Setup the menu bar"""
         menubar = self.menuBar()
@@ -645,6 +759,10 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
 
+        diagnostics_action = QAction(QIcon(), "Diagnostics", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        help_menu.addAction(diagnostics_action)
+
     def setup_toolbar(self):
         """Setup the toolbar"""
         toolbar = QToolBar("Main Toolbar", self)
@@ -670,6 +788,13 @@ class MainWindow(QMainWindow):
         export_action.triggered.connect(self.export_results)
         toolbar.addAction(export_action)
 
+        toolbar.addSeparator()
+        toolbar.addWidget(QLabel("Dataset: "))
+        self.dataset_combo = QComboBox(self)
+        self.dataset_combo.setMinimumWidth(200)
+        self.dataset_combo.currentTextChanged.connect(self.switch_dataset)
+        toolbar.addWidget(self.dataset_combo)
+
         self.addToolBar(toolbar)
 
     def setup_statusbar(self):
@@ -678,8 +803,28 @@ class MainWindow(QMainWindow):
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setMaximum(100)
         self.status_bar.addPermanentWidget(self.progress_bar)
+        self.cancel_btn = QPushButton("Cancel", self)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(lambda: self.job_runner.cancel())
+        self.status_bar.addPermanentWidget(self.cancel_btn)
         self.setStatusBar(self.status_bar)
 
+        # Background job progress
+        self.job_runner.progress.connect(self.on_job_progress)
+        self.job_runner.busy_changed.connect(self.cancel_btn.setVisible)
+
+    def on_job_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.status_bar.showMessage(message)
+
+    def closeEvent(self, event):
+        """Stop background jobs before the window goes away"""
+        self.job_runner.cancel()
+        self.job_runner.pool.waitForDone()
+        self.autosaver.wait()
+        self.workspace.close()
+        super().closeEvent(event)
+
     def show_welcome_message(self):
         """Show welcome message in the status bar"""
         self.status_bar.showMessage("Welcome to Green Finance AI Platform", 5000)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import QTableView, QHeaderView
+
+
+class ColumnTableModel(QAbstractTableModel):
+    """Read-only table backed directly by NumPy/pandas columns.
+
+    Cells are formatted lazily in data(), so only rows the view actually
+    paints are ever converted to text. Sorting and filtering work on a row
+    index array (argsort / boolean masks) instead of per-row comparisons,
+    and never touch the underlying columns.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._columns = []
+        self._formats = []
+        self._rows = np.arange(0)
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._filter = None
+
+    def set_columns(self, columns, formats=None):
+        """Replace the table contents.
+
+        columns maps header -> array-like; formats maps header -> a format
+        string such as '{:.2f}' or a callable returning the cell text.
+        """
+        formats = formats or {}
+        self.beginResetModel()
+        self._headers = list(columns)
+        self._columns = [np.asarray(values) for values in columns.values()]
+        self._formats = [formats.get(header, str) for header in self._headers]
+        self._rows = self._visible_rows()
+        self._apply_sort()
+        self.endResetModel()
+
+    def update_column(self, header, values):
+        """Swap the data behind one column without resetting the view"""
+        column = self._headers.index(header)
+        self._columns[column] = np.asarray(values)
+        if column == self._sort_column:
+            self.layoutAboutToBeChanged.emit()
+            self._apply_sort()
+            self.layoutChanged.emit()
+        if len(self._rows):
+            self.dataChanged.emit(
+                self.index(0, column), self.index(len(self._rows) - 1, column),
+                [Qt.ItemDataRole.DisplayRole]
+            )
+
+    def column_values(self, header):
+        return self._columns[self._headers.index(header)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._columns[column][self._rows[index.row()]]
+            fmt = self._formats[column]
+            return fmt.format(value) if isinstance(fmt, str) else fmt(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if self._columns[column].dtype.kind in 'iuf':
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return str(self._rows[section] + 1)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # A negative column (no sort indicator) restores the original order
+        self._sort_column = column if column >= 0 else None
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        if self._sort_column is None:
+            self._rows = np.sort(self._rows)
+        self._apply_sort()
+        self.layoutChanged.emit()
+
+    def set_filter(self, text, header):
+        """Show only rows whose header column contains text (case-insensitive)"""
+        self._filter = (text, header) if text else None
+        self.beginResetModel()
+        self._rows = self._visible_rows()
+        self._apply_sort()
+        self.endResetModel()
+
+    def _visible_rows(self):
+        n_rows = len(self._columns[0]) if self._columns else 0
+        if self._filter is None or self._filter[1] not in self._headers:
+            return np.arange(n_rows)
+        text, header = self._filter
+        values = pd.Series(self.column_values(header)).astype(str)
+        return np.flatnonzero(values.str.contains(text, case=False, regex=False).to_numpy())
+
+    def _apply_sort(self):
+        if self._sort_column is None or self._sort_column >= len(self._columns):
+            return
+        rows = np.sort(self._rows)
+        keys = self._columns[self._sort_column][rows]
+        order = np.argsort(keys, kind='stable')
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            order = order[::-1]
+        self._rows = rows[order]
+
+
+def create_table_view(model, parent=None):
+    """QTableView set up for large models: fixed row heights, header sorting"""
+    view = QTableView(parent)
+    view.setModel(model)
+    view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+    view.setSortingEnabled(True)
+    view.setAlternatingRowColors(True)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+    return view
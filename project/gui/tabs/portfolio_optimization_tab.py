@@ -1,58 +1,278 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, 
-    QLabel, QTableWidget, QTableWidgetItem)
-import matplotlib.pyplot as plt
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+    QLabel, QSlider, QMessageBox)
+from PyQt6.QtCore import Qt, QTimer
+import numpy as np
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from models.data.constants import DEFAULT_RISK_TOLERANCE, VAR_CONFIDENCE
+from models.instrumentation import timed
+from ..charts import (BlitManager, DENSITY_BIN_PIXELS, DENSITY_THRESHOLD,
+    chart_setting, density_grid)
+from ..table_model import ColumnTableModel, create_table_view
+
+# Slider positions per unit of risk tolerance
+SLIDER_STEPS = 1000
+
+def padded_range(values, margin=0.05):
+    low, high = float(np.min(values)), float(np.max(values))
+    pad = (high - low) * margin or 0.5
+    return low - pad, high + pad
 
 class PortfolioOptimizationTab(QWidget):
-    def __init__(self, project_evaluator):
+    def __init__(self, project_evaluator, job_runner):
         super().__init__()
         self.project_evaluator = project_evaluator
+        self.job_runner = job_runner
+        self.frontier = None
+        self.weights = None
+        # Monte Carlo VaR/CVaR along the frontier, from simulate_risk()
+        self.risk = None
+        # Large project sets are drawn as a density image instead of markers
+        self.dense = False
+        self.density = None
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
         # Optimization controls
+        button_layout = QHBoxLayout()
         self.optimize_btn = QPushButton("Optimize Portfolio")
         self.optimize_btn.clicked.connect(self.optimize_portfolio)
-        layout.addWidget(self.optimize_btn)
+        button_layout.addWidget(self.optimize_btn)
+        self.simulate_btn = QPushButton("Simulate Risk (VaR/CVaR)")
+        self.simulate_btn.clicked.connect(self.simulate_risk)
+        button_layout.addWidget(self.simulate_btn)
+        layout.addLayout(button_layout)
+
+        # Risk tolerance slider, interpolating over the precomputed frontier
+        slider_layout = QHBoxLayout()
+        self.tolerance_label = QLabel()
+        self.tolerance_slider = QSlider(Qt.Orientation.Horizontal)
+        self.tolerance_slider.setEnabled(False)
+        self.tolerance_slider.valueChanged.connect(self.on_tolerance_changed)
+        slider_layout.addWidget(QLabel("Risk tolerance:"))
+        slider_layout.addWidget(self.tolerance_slider)
+        slider_layout.addWidget(self.tolerance_label)
+        layout.addLayout(slider_layout)
+
+        self.risk_label = QLabel()
+        layout.addWidget(self.risk_label)
 
         # Matplotlib figure for efficient frontier
-        self.figure, self.ax = plt.subplots()
+        self.figure = Figure()
+        self.ax = self.figure.add_subplot()
         self.canvas = FigureCanvas(self.figure)
+        self.blit_manager = BlitManager(self.canvas)
+        self.setup_plot()
+        layout.addWidget(NavigationToolbar(self.canvas, self))
         layout.addWidget(self.canvas)
 
+        # Re-bin the density image once per batch of zoom/pan/resize events
+        self.density_timer = QTimer(self)
+        self.density_timer.setSingleShot(True)
+        self.density_timer.timeout.connect(self.refresh_density)
+        self.ax.callbacks.connect('xlim_changed', self.schedule_density)
+        self.ax.callbacks.connect('ylim_changed', self.schedule_density)
+        self.canvas.mpl_connect('resize_event', self.schedule_density)
+
         # Results table
-        self.table = QTableWidget()
+        self.table_model = ColumnTableModel(self)
+        self.table = create_table_view(self.table_model)
         layout.addWidget(self.table)
 
     def optimize_portfolio(self):
         if self.project_evaluator.has_data():
-            weights = self.project_evaluator.optimize_portfolio()
-            self.update_visualization(weights)
-            self.update_table(weights)
+            self.job_runner.submit(
+                "Optimize portfolio", self.project_evaluator.compute_frontier,
+                on_done=self.show_frontier,
+                on_error=lambda message: QMessageBox.critical(self, "Error", message)
+            )
 
-    def update_visualization(self, weights):
-        self.ax.clear()
-        # Plot efficient frontier
-        returns = self.project_evaluator.get_expected_returns()
-        risks = self.project_evaluator.get_risks()
-        self.ax.scatter(risks, returns)
+    def simulate_risk(self):
+        if self.project_evaluator.has_data():
+            self.job_runner.submit(
+                "Simulate portfolio risk",
+                lambda progress: self.project_evaluator.simulate_frontier_risk(progress=progress),
+                on_done=self.show_risk,
+                on_error=lambda message: QMessageBox.critical(self, "Error", message)
+            )
+
+    def show_risk(self, risk):
+        self.risk = risk
+        self.update_risk_label()
+
+    def update_risk_label(self):
+        """VaR/CVaR of the portfolio at the current risk tolerance"""
+        if self.risk is None:
+            self.risk_label.setText("")
+            return
+        tolerance = self.current_risk_tolerance() if self.frontier is not None else DEFAULT_RISK_TOLERANCE
+        # Simulated per frontier point; interpolate like the weights
+        var = np.interp(tolerance, self.risk['tolerance'], self.risk['var'])
+        cvar = np.interp(tolerance, self.risk['tolerance'], self.risk['cvar'])
+        self.risk_label.setText(f"Simulated loss at {VAR_CONFIDENCE:.0%} confidence: "
+                                f"VaR {var:.4f}, CVaR {cvar:.4f}")
+
+    @timed('ui.portfolio.show_frontier', category='ui')
+    def show_frontier(self, frontier):
+        if frontier is not None:
+            self.frontier = frontier
+            tolerances = self.frontier['tolerance']
+
+            self.tolerance_slider.blockSignals(True)
+            self.tolerance_slider.setRange(
+                int(round(tolerances[0] * SLIDER_STEPS)),
+                int(round(tolerances[-1] * SLIDER_STEPS))
+            )
+            self.tolerance_slider.setValue(int(round(DEFAULT_RISK_TOLERANCE * SLIDER_STEPS)))
+            self.tolerance_slider.blockSignals(False)
+            self.tolerance_slider.setEnabled(True)
+
+            self.weights = self.current_weights()
+            self.update_visualization(self.weights)
+            self.update_table(self.weights)
+            self.update_risk_label()
+
+    def reset(self):
+        """Clear the chart and table, e.g. after switching datasets"""
+        self.frontier = None
+        self.weights = None
+        self.risk = None
+        self.risk_label.setText("")
+        self.tolerance_slider.setEnabled(False)
+        self.tolerance_label.setText("")
+        self.dense = False
+        self.projects.set_offsets(np.empty((0, 2)))
+        self.frontier_line.set_data([], [])
+        self.selection.set_data([], [])
+        if self.density is not None:
+            self.density.set_visible(False)
+        self.table_model.set_columns({})
+        self.canvas.draw_idle()
+
+    def current_risk_tolerance(self):
+        return self.tolerance_slider.value() / SLIDER_STEPS
+
+    def current_weights(self):
+        return self.project_evaluator.portfolio_optimizer.frontier_weights(
+            self.frontier, self.current_risk_tolerance()
+        )
+
+    def on_tolerance_changed(self, value):
+        if self.frontier is None:
+            return
+        # Interpolation only; no solver calls while the slider moves
+        self.weights = self.current_weights()
+        self.update_selection(self.weights)
+        self.update_weights(self.weights)
+        self.update_risk_label()
+
+    def setup_plot(self):
+        """Create the chart artists once; updates only change their data"""
+        self.projects = self.ax.scatter(np.empty(0), np.empty(0), s=10, alpha=0.4, label='Projects')
+        self.frontier_line, = self.ax.plot([], [], color='tab:green', label='Efficient frontier')
+        self.selection, = self.ax.plot([], [], 'o', color='tab:red',
+                                       markersize=8, label='Selected portfolio')
+        self.blit_manager.set_artists([self.selection])
         self.ax.set_xlabel('Risk')
         self.ax.set_ylabel('Expected Return')
         self.ax.set_title('Portfolio Optimization Results')
-        self.canvas.draw()
+        self.ax.legend(loc='best')
+
+    @timed('ui.portfolio.update_visualization', category='ui')
+    def update_visualization(self, weights):
+        # Per-project risk/return with the efficient frontier on top
+        risks = self.frontier['project_risks']
+        returns = self.frontier['project_returns']
+        self.dense = len(risks) > chart_setting('chart_density_threshold', DENSITY_THRESHOLD)
+        self.projects.set_offsets(np.empty((0, 2)) if self.dense else np.column_stack([risks, returns]))
+        self.frontier_line.set_data(self.frontier['risk'], self.frontier['return'])
+
+        # relim() ignores scatter collections, so fit the limits to the data directly
+        x = np.concatenate([risks, self.frontier['risk']])
+        y = np.concatenate([returns, self.frontier['return']])
+        self.ax.set_xlim(*padded_range(x))
+        self.ax.set_ylim(*padded_range(y))
+
+        self.update_density()
+        # The limit changes above already scheduled a re-bin that is now redundant
+        self.density_timer.stop()
+        self.update_selection(weights, redraw=False)
+        self.canvas.draw_idle()
+
+    def schedule_density(self, *args):
+        if self.dense and not self.density_timer.isActive():
+            self.density_timer.start(0)
 
+    def refresh_density(self):
+        self.update_density()
+        self.canvas.draw_idle()
+
+    @timed('ui.portfolio.update_density', category='ui')
+    def update_density(self):
+        """Bin the projects inside the visible range, a few screen pixels per bin"""
+        if not self.dense:
+            if self.density is not None:
+                self.density.set_visible(False)
+            return
+
+        xlim = sorted(self.ax.get_xlim())
+        ylim = sorted(self.ax.get_ylim())
+        shape = (max(1, int(self.ax.bbox.height // DENSITY_BIN_PIXELS)),
+                 max(1, int(self.ax.bbox.width // DENSITY_BIN_PIXELS)))
+        counts = density_grid(self.frontier['project_risks'], self.frontier['project_returns'],
+                              xlim, ylim, shape)
+        image = np.ma.masked_equal(counts, 0)
+        extent = (xlim[0], xlim[1], ylim[0], ylim[1])
+
+        if self.density is None:
+            # Limits are already set explicitly, so imshow does not rescale the axes
+            self.density = self.ax.imshow(
+                image, extent=extent, origin='lower', aspect='auto',
+                interpolation='nearest', cmap='viridis', norm=LogNorm(), zorder=1
+            )
+        else:
+            self.density.set_data(image)
+            self.density.set_extent(extent)
+        # An empty view has nothing to colour (and no valid log range)
+        if counts.any():
+            self.density.autoscale()
+        self.density.set_visible(bool(counts.any()))
+
+    @timed('ui.portfolio.update_selection', category='ui')
+    def update_selection(self, weights, redraw=True):
+        """Move the selected-portfolio marker and refresh the tolerance label"""
+        portfolio_risk = weights @ self.frontier['project_risks']
+        portfolio_return = weights @ self.frontier['project_returns']
+        self.selection.set_data([portfolio_risk], [portfolio_return])
+        self.tolerance_label.setText(f"{self.current_risk_tolerance():.2f}")
+        if redraw:
+            # Only the marker moves, so repaint it over the cached chart
+            self.blit_manager.update()
+
+    @timed('ui.portfolio.update_table', category='ui')
     def update_table(self, weights):
         data = self.project_evaluator.get_projects()
         if data is None:
             return
 
-        self.table.setRowCount(len(data))
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Project", "Weight", "Allocation"])
+        self.table_model.set_columns({
+            "Project": data["Project Name"].to_numpy(),
+            "Weight": weights,
+            "Allocation": weights * 1000000
+        }, {
+            "Weight": "{:.2%}",
+            "Allocation": "${:,.2f}"
+        })
 
-        for i in range(len(data)):
-            self.table.setItem(i, 0, QTableWidgetItem(data.iloc[i]["Project Name"]))
-            self.table.setItem(i, 1, QTableWidgetItem(f"{weights[i]:.2%}"))
-            self.table.setItem(i, 2, QTableWidgetItem(f"${weights[i] * 1000000:,.2f}"))
\ No newline at end of file
+    @timed('ui.portfolio.update_weights', category='ui')
+    def update_weights(self, weights):
+        """Refresh only the weight columns; cheap enough to run while dragging"""
+        if self.table_model.rowCount() != len(weights):
+            self.update_table(weights)
+            return
+        self.table_model.update_column("Weight", weights)
+        self.table_model.update_column("Allocation", weights * 1000000)
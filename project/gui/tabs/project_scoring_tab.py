@@ -1,12 +1,15 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
-    QPushButton, QLabel, QTableWidget, QTableWidgetItem)
+    QPushButton, QLabel, QLineEdit, QMessageBox)
 from PyQt6.QtCore import Qt
 import pandas as pd
+from models.instrumentation import timed
+from ..table_model import ColumnTableModel, create_table_view
 
 class ProjectScoringTab(QWidget):
-    def __init__(self, project_evaluator):
+    def __init__(self, project_evaluator, job_runner):
         super().__init__()
         self.project_evaluator = project_evaluator
+        self.job_runner = job_runner
         self.setup_ui()
 
     def setup_ui(self):
@@ -18,41 +21,47 @@ class ProjectScoringTab(QWidget):
         self.load_btn.clicked.connect(self.load_projects)
         self.evaluate_btn = QPushButton("Evaluate Projects")
         self.evaluate_btn.clicked.connect(self.evaluate_projects)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by project name")
+        self.filter_edit.textChanged.connect(self.filter_projects)
         controls_layout.addWidget(self.load_btn)
         controls_layout.addWidget(self.evaluate_btn)
+        controls_layout.addWidget(self.filter_edit)
         layout.addLayout(controls_layout)
 
         # Results table
-        self.table = QTableWidget()
+        self.table_model = ColumnTableModel(self)
+        self.table = create_table_view(self.table_model)
         layout.addWidget(self.table)
 
     def load_projects(self):
         # In a real application, this would load actual project data
-        self.project_evaluator.load_sample_data()
-        self.update_table()
+        self.job_runner.submit(
+            "Load projects", self.project_evaluator.load_sample_data,
+            on_done=lambda _: self.update_table(), on_error=self.show_error
+        )
 
     def evaluate_projects(self):
-        scores = self.project_evaluator.evaluate_projects()
-        self.update_table(scores)
+        self.job_runner.submit(
+            "Evaluate projects", self.project_evaluator.evaluate_projects,
+            on_done=self.update_table, on_error=self.show_error
+        )
 
+    def show_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+
+    def filter_projects(self, text):
+        self.table_model.set_filter(text, "Project Name")
+
+    @timed('ui.scoring.update_table', category='ui')
     def update_table(self, scores=None):
         data = self.project_evaluator.get_projects()
         if data is None:
             return
 
-        self.table.setRowCount(len(data))
-        self.table.setColumnCount(len(data.columns))
-        self.table.setHorizontalHeaderLabels(data.columns)
-
-        for i in range(len(data)):
-            for j in range(len(data.columns)):
-                item = QTableWidgetItem(str(data.iloc[i, j]))
-                self.table.setItem(i, j, item)
-
+        columns = {column: data[column].to_numpy() for column in data.columns}
+        formats = {}
         if scores is not None:
-            self.table.setColumnCount(len(data.columns) + 1)
-            headers = list(data.columns) + ["ESG Score"]
-            self.table.setHorizontalHeaderLabels(headers)
-            for i, score in enumerate(scores):
-                item = QTableWidgetItem(f"{score:.2f}")
-                self.table.setItem(i, len(data.columns), item)
\ No newline at end of file
+            columns["ESG Score"] = scores
+            formats["ESG Score"] = "{:.2f}"
+        self.table_model.set_columns(columns, formats)
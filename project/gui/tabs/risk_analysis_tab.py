@@ -1,12 +1,19 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, 
-    QLabel, QTableWidget, QTableWidgetItem)
-import matplotlib.pyplot as plt
+    QLabel, QMessageBox)
+import numpy as np
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from models.instrumentation import timed
+from ..charts import BlitManager, MAX_BARS, aggregate_bars, chart_setting, thin_ticks
+from ..table_model import ColumnTableModel, create_table_view
 
 class RiskAnalysisTab(QWidget):
-    def __init__(self, project_evaluator):
+    def __init__(self, project_evaluator, job_runner):
         super().__init__()
         self.project_evaluator = project_evaluator
+        self.job_runner = job_runner
+        self.bars = None
+        self.tick_labels = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -18,41 +25,80 @@ class RiskAnalysisTab(QWidget):
         layout.addWidget(self.analyze_btn)
 
         # Matplotlib figure for risk visualization
-        self.figure, self.ax = plt.subplots()
+        self.figure = Figure()
+        self.ax = self.figure.add_subplot()
+        self.ax.set_ylabel('Risk Score')
+        self.ax.set_title('Project Risk Analysis')
+        self.ax.set_ylim(0, 1)
         self.canvas = FigureCanvas(self.figure)
+        self.blit_manager = BlitManager(self.canvas)
         layout.addWidget(self.canvas)
 
         # Risk metrics table
-        self.table = QTableWidget()
+        self.table_model = ColumnTableModel(self)
+        self.table = create_table_view(self.table_model)
         layout.addWidget(self.table)
 
     def analyze_risks(self):
         if self.project_evaluator.has_data():
-            risk_metrics = self.project_evaluator.analyze_risks()
+            self.job_runner.submit(
+                "Analyze risks", self.project_evaluator.analyze_risks,
+                on_done=self.show_risks,
+                on_error=lambda message: QMessageBox.critical(self, "Error", message)
+            )
+
+    def show_risks(self, risk_metrics):
+        if risk_metrics is not None:
             self.update_visualization(risk_metrics)
             self.update_table(risk_metrics)
 
+    @timed('ui.risk.update_visualization', category='ui')
     def update_visualization(self, risk_metrics):
-        self.ax.clear()
-        # Create risk heatmap
-        projects = self.project_evaluator.get_projects()
-        risks = risk_metrics['risk_score']
-        self.ax.bar(range(len(risks)), risks)
-        self.ax.set_xlabel('Projects')
-        self.ax.set_ylabel('Risk Score')
-        self.ax.set_title('Project Risk Analysis')
-        plt.xticks(range(len(risks)), projects['Project Name'], rotation=45)
-        self.canvas.draw()
+        heights, starts = aggregate_bars(risk_metrics['risk_score'], chart_setting('chart_max_bars', MAX_BARS))
+        names = np.asarray(risk_metrics['project'])
+        ticks = thin_ticks(len(heights))
+        tick_labels = list(names[starts[ticks]])
+
+        if self.bars is not None and len(self.bars) == len(heights) and tick_labels == self.tick_labels:
+            # Same layout: move the existing bars and repaint only them
+            for bar, height in zip(self.bars, heights):
+                bar.set_height(height)
+            self.blit_manager.update()
+            return
+
+        if self.bars is not None:
+            self.bars.remove()
+        self.bars = self.ax.bar(np.arange(len(heights)), heights, width=0.8)
+        self.blit_manager.set_artists(self.bars.patches)
+        self.tick_labels = tick_labels
+        self.ax.set_xlim(-0.5, len(heights) - 0.5)
+        self.ax.set_xticks(ticks, tick_labels, rotation=45, ha='right')
+        grouped = len(heights) < len(names)
+        self.ax.set_xlabel(f'Projects (mean of ~{len(names) / len(heights):.0f} per bar)' if grouped else 'Projects')
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def reset(self):
+        """Clear the chart and table, e.g. after switching datasets"""
+        if self.bars is not None:
+            self.bars.remove()
+            self.bars = None
+        self.blit_manager.set_artists([])
+        self.tick_labels = None
+        self.ax.set_xticks([])
+        self.ax.set_xlabel('')
+        self.table_model.set_columns({})
+        self.canvas.draw_idle()
 
+    @timed('ui.risk.update_table', category='ui')
     def update_table(self, risk_metrics):
-        self.table.setRowCount(len(risk_metrics))
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels([
-            "Project", "Risk Score", "Environmental Risk", "Financial Risk"
-        ])
-
-        for i in range(len(risk_metrics)):
-            self.table.setItem(i, 0, QTableWidgetItem(risk_metrics['project'][i]))
-            self.table.setItem(i, 1, QTableWidgetItem(f"{risk_metrics['risk_score'][i]:.2f}"))
-            self.table.setItem(i, 2, QTableWidgetItem(f"{risk_metrics['env_risk'][i]:.2f}"))
-            self.table.setItem(i, 3, QTableWidgetItem(f"{risk_metrics['fin_risk'][i]:.2f}"))
\ No newline at end of file
+        self.table_model.set_columns({
+            "Project": risk_metrics['project'],
+            "Risk Score": risk_metrics['risk_score'],
+            "Environmental Risk": risk_metrics['env_risk'],
+            "Financial Risk": risk_metrics['fin_risk']
+        }, {
+            "Risk Score": "{:.2f}",
+            "Environmental Risk": "{:.2f}",
+            "Financial Risk": "{:.2f}"
+        })
@@ -1,12 +1,35 @@
+import time
+START = time.perf_counter()
+
+import os
 import sys
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from gui.main_window import MainWindow
 
+def report_startup(stages):
+    """Print how long each startup stage took, measured from process start"""
+    previous = START
+    for name, moment in stages:
+        print(f"{name:<14} {1000 * (moment - previous):8.1f} ms", file=sys.stderr)
+        previous = moment
+    print(f"{'total':<14} {1000 * (previous - START):8.1f} ms", file=sys.stderr)
+
 def main():
+    # Startup report with --startup-timing or GFAI_STARTUP_TIMING=1
+    timing = '--startup-timing' in sys.argv or os.environ.get('GFAI_STARTUP_TIMING') == '1'
+    stages = [('imports', time.perf_counter())]
     app = QApplication(sys.argv)
     window = MainWindow()
+    stages.append(('window', time.perf_counter()))
     window.show()
+    if timing:
+        # Zero-delay timers run once the first paint events have been processed
+        def first_paint():
+            stages.append(('first paint', time.perf_counter()))
+            report_startup(stages)
+        QTimer.singleShot(0, first_paint)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a request still fails after all retries"""
+
+
+class AsyncESGClient:
+    """Pooled asyncio HTTP client for the ESG endpoints.
+
+    One httpx.AsyncClient (and its connection pool) is shared by every
+    request made inside ``async with``. At most ``max_concurrency``
+    requests are in flight at once; failed attempts are retried with
+    exponential backoff and jitter, and each request as a whole is bounded
+    by ``deadline`` seconds, retries included.
+
+    With a ResponseCache, responses younger than their TTL are served from
+    disk, older ones are revalidated with If-None-Match/If-Modified-Since,
+    and within ``stale_while_revalidate`` seconds past the TTL the stale
+    copy is returned at once and the request is queued in
+    ``stale_requests`` for the caller to revalidate later.
+    """
+
+    def __init__(self, max_concurrency=8, timeout=10.0, deadline=30.0,
+                 retries=3, backoff=0.5, max_backoff=8.0, verify=True,
+                 cache=None, stale_while_revalidate=0):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.verify = verify
+        self.cache = cache
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_requests = []
+        self.client = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            verify=self.verify,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    def retry_delay(self, attempt, response=None):
+        if response is not None and 'Retry-After' in response.headers:
+            try:
+                return min(float(response.headers['Retry-After']), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def get(self, url, params=None, headers=None):
+        """GET with retries; returns the final httpx.Response"""
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                # Only hold a concurrency slot while a request is on the wire
+                async with self.semaphore:
+                    response = await self.client.get(url, params=params, headers=headers)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise FetchError(f"{url}: {e}") from e
+                await asyncio.sleep(self.retry_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                await asyncio.sleep(self.retry_delay(attempt, response))
+                continue
+            return response
+
+    async def fetch_json(self, url, params=None, ttl=0):
+        """Fetch and decode one JSON document, from the cache when fresh enough"""
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get(self.cache.make_key(url, params))
+        if entry is not None:
+            age = time.time() - entry['fetched_at']
+            if age < ttl:
+                return json.loads(entry['body'])
+            if age < ttl + self.stale_while_revalidate:
+                self.stale_requests.append((url, params))
+                return json.loads(entry['body'])
+        return await self.revalidate(url, params, entry)
+
+    async def revalidate(self, url, params=None, entry=None):
+        """Fetch from the network, conditionally when a cached copy exists"""
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = await asyncio.wait_for(self.get(url, params, headers), self.deadline)
+        except asyncio.TimeoutError as e:
+            raise FetchError(f"{url}: no response within {self.deadline}s") from e
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(self.cache.make_key(url, params))
+            return json.loads(entry['body'])
+        if response.status_code != 200:
+            raise FetchError(f"{url}: HTTP {response.status_code}")
+        data = response.json()
+        if self.cache is not None:
+            self.cache.put(
+                self.cache.make_key(url, params), url, response.content,
+                response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+        return data
+
+    async def revalidate_all(self, requests):
+        """Refresh (url, params) pairs against the network, ignoring freshness"""
+        async def refresh(url, params):
+            entry = self.cache.get(self.cache.make_key(url, params))
+            return await self.revalidate(url, params, entry)
+        return await asyncio.gather(
+            *(refresh(url, params) for url, params in requests),
+            return_exceptions=True
+        )
+
+    async def fetch_all(self, requests):
+        """Fetch {name: (url, params, ttl)} concurrently.
+
+        Returns {name: decoded JSON or the exception raised for it}, so one
+        failing endpoint does not discard the others.
+        """
+        names = list(requests)
+        results = await asyncio.gather(
+            *(self.fetch_json(url, params, ttl) for url, params, ttl in requests.values()),
+            return_exceptions=True
+        )
+        return dict(zip(names, results))
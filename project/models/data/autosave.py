@@ -0,0 +1,224 @@
+"""Background autosave: atomic checkpoints plus a row-level journal.
+
+A checkpoint is an ordinary .gfp project written by save_project_file
+(temp file, fsync, rename). Between checkpoints only the rows whose
+contents changed are appended to <project>.journal, one JSON record per
+line, each tagged with the generation id stored in its checkpoint's
+settings. replay_journal() applies those records after a load, so a
+crash between checkpoints loses at most the last interval of changes.
+"""
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .project_store import PROJECT_SUFFIX, save_project_file
+
+JOURNAL_SUFFIX = '.journal'
+# Above this fraction of changed rows a checkpoint is written instead of a journal record
+CHECKPOINT_FRACTION = 0.2
+# Journal records kept before the next write becomes a checkpoint
+MAX_JOURNAL_RECORDS = 100
+
+
+def journal_path(file_path):
+    return f"{file_path}{JOURNAL_SUFFIX}"
+
+
+def autosave_path(file_path):
+    """The .gfp project a file autosaves to; legacy JSON/CSV sources are never overwritten"""
+    return str(Path(file_path).with_suffix(PROJECT_SUFFIX))
+
+
+def _check_project_path(file_path):
+    if Path(file_path).suffix.lower() != PROJECT_SUFFIX:
+        raise ValueError(f"Auto-save only writes {PROJECT_SUFFIX} projects, not {file_path}")
+
+
+def row_hashes(data):
+    return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+
+def _as_column(values, dtype):
+    try:
+        return pd.Series(values).astype(dtype).to_numpy()
+    except (TypeError, ValueError):
+        # e.g. missing values in an integer column; keep what was journaled
+        return np.asarray(values, dtype=object)
+
+
+def apply_record(data, record):
+    """Apply one journal record: resize to n_rows, then overwrite the changed rows"""
+    dtypes = data.dtypes
+    n_rows = record['n_rows']
+    if n_rows > len(data):
+        data = data.reindex(pd.RangeIndex(n_rows))
+    elif n_rows < len(data):
+        data = data.iloc[:n_rows].copy()
+
+    rows = np.asarray(record['rows'], dtype=np.int64)
+    values = list(zip(*record['data'])) if record['data'] else [[] for _ in record['columns']]
+    for column, column_values in zip(record['columns'], values):
+        position = data.columns.get_loc(column)
+        data.iloc[rows, position] = _as_column(column_values, dtypes[column])
+
+    # Growing the frame upcasts integer columns to float; restore them once filled
+    restore = {column: dtype for column, dtype in dtypes.items()
+               if data[column].dtype != dtype and not data[column].isna().any()}
+    return data.astype(restore) if restore else data
+
+
+def replay_journal(file_path, data, settings):
+    """Apply the journal next to file_path to its loaded checkpoint.
+
+    Returns (data, records applied). Records from another generation
+    (a journal left over from before the last checkpoint) are skipped,
+    and a torn final line from a crash mid-append ends the replay.
+    """
+    generation = settings.get('autosave_generation')
+    path = journal_path(file_path)
+    if generation is None or not os.path.exists(path):
+        return data, 0
+
+    applied = 0
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record.get('generation') != generation:
+                continue
+            data = apply_record(data, record)
+            applied += 1
+    return data, applied
+
+
+class ProjectAutosaver:
+    """Writes autosaves of one project on a background thread.
+
+    submit() only copies the data and returns; the writer thread compares
+    row hashes with the last write and appends the changed rows to the
+    journal, or writes a full checkpoint when the columns changed, too many
+    rows changed or the journal is long. A newer submit() replaces a write
+    that has not started yet. Errors are kept for take_error().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread = None
+        self.writing = False
+        self.pending = None
+        self.error = None
+        # State of the last successful write
+        self.file_path = None
+        self.generation = None
+        self.hashes = None
+        self.schema = None
+        self.journal_records = 0
+
+    def track(self, file_path, data, settings, journal_records=0):
+        """Use a loaded project, after replay_journal, as the baseline for the next write"""
+        self.wait()
+        self.file_path = file_path
+        self.generation = settings.get('autosave_generation')
+        self.hashes = row_hashes(data)
+        self.schema = list(data.dtypes.items())
+        self.journal_records = journal_records
+
+    def submit(self, file_path, data, settings):
+        _check_project_path(file_path)
+        # Numeric columns are copied, text columns only copy references
+        job = (file_path, data.copy(), dict(settings))
+        with self.lock:
+            self.pending = job
+            if self.writing:
+                return
+            self.writing = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                job, self.pending = self.pending, None
+                if job is None:
+                    self.writing = False
+                    return
+            try:
+                self.write(*job)
+            except Exception as e:
+                self.error = e
+                # The journal may now be incomplete; start over with a checkpoint
+                self.generation = None
+
+    def write(self, file_path, data, settings):
+        """Journal or checkpoint data; returns 'journal', 'checkpoint' or 'unchanged'"""
+        _check_project_path(file_path)
+        hashes = row_hashes(data)
+        if (file_path != self.file_path or self.generation is None
+                or list(data.dtypes.items()) != self.schema
+                or self.journal_records >= MAX_JOURNAL_RECORDS):
+            return self.checkpoint(file_path, data, settings, hashes)
+
+        overlap = min(len(hashes), len(self.hashes))
+        rows = np.concatenate([
+            np.flatnonzero(hashes[:overlap] != self.hashes[:overlap]),
+            np.arange(overlap, len(hashes))
+        ])
+        if len(rows) == 0 and len(hashes) == len(self.hashes):
+            return 'unchanged'
+        if len(rows) > CHECKPOINT_FRACTION * len(data):
+            return self.checkpoint(file_path, data, settings, hashes)
+
+        changes = data.iloc[rows].to_dict(orient='split', index=False)
+        record = {
+            'generation': self.generation,
+            'n_rows': len(data),
+            'rows': rows.tolist(),
+            'columns': [str(column) for column in changes['columns']],
+            'data': changes['data']
+        }
+        # default=str covers timestamps; floats keep their exact repr
+        line = json.dumps(record, default=str) + '\n'
+        with open(journal_path(file_path), 'a', encoding='utf-8') as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+        self.hashes = hashes
+        self.journal_records += 1
+        return 'journal'
+
+    def checkpoint(self, file_path, data, settings, hashes=None):
+        _check_project_path(file_path)
+        generation = uuid.uuid4().hex
+        save_project_file(file_path, data, {**settings, 'autosave_generation': generation})
+        # Records of the previous generation are skipped on replay, but drop them anyway
+        try:
+            os.remove(journal_path(file_path))
+        except FileNotFoundError:
+            pass
+        self.file_path = file_path
+        self.generation = generation
+        self.hashes = row_hashes(data) if hashes is None else hashes
+        self.schema = list(data.dtypes.items())
+        self.journal_records = 0
+        return 'checkpoint'
+
+    def save(self, file_path, data, settings):
+        """Write a checkpoint now, in the calling thread, after any queued autosave"""
+        self.wait()
+        return self.checkpoint(file_path, data, settings)
+
+    def wait(self):
+        thread = self.thread
+        if thread is not None:
+            thread.join()
+
+    def take_error(self):
+        error, self.error = self.error, None
+        return error
@@ -7,6 +7,18 @@ ESG_ENDPOINTS = {
     'governance': 'https://api.esgdata.org/governance'
 }
 
+# Seconds a cached endpoint response stays fresh. Carbon intensity is
+# published every half hour; past days of history no longer change.
+ENDPOINT_TTLS = {
+    'environmental': 30 * 60,
+    'sustainability': 24 * 60 * 60,
+    'history': 7 * 24 * 60 * 60
+}
+
+# Seconds past its TTL a response may still be served while it is
+# revalidated in the background
+STALE_WHILE_REVALIDATE = 6 * 60 * 60
+
 # Scoring weights
 ESG_WEIGHTS = {
     'CO2 Reduction': 0.3,
@@ -16,10 +28,42 @@ ESG_WEIGHTS = {
     'Governance Score': 0.2
 }
 
+# Numeric project columns consumed by the ML models
+FEATURE_COLUMNS = [
+    'CO2 Reduction',
+    'Energy Savings',
+    'Social Impact',
+    'Governance Score',
+    'Job Creation',
+    'Investment (M)'
+]
+
+# Incremental re-evaluation: rows whose features changed are re-scored
+# with the fitted models unless more than this fraction of the projects
+# changed, or a feature mean moved by more than DRIFT_THRESHOLD standard
+# deviations since the last fit, in which case everything is refitted
+INCREMENTAL_MAX_FRACTION = 0.2
+DRIFT_THRESHOLD = 0.1
+
+# Training rows above which ESGScorer's 'auto' profile picks the 'large' backend
+ESG_LARGE_N_THRESHOLD = 200000
+
+# RAM for the datasets resident in a workspace; least recently used ones
+# beyond it are spilled to memory-mapped files
+WORKSPACE_MEMORY_BUDGET = 2 * 1024 ** 3
+
 # Default values
 DEFAULT_PROJECT_COUNT = 10
 DEFAULT_RISK_TOLERANCE = 0.5
 
+# Risk tolerances covered by the precomputed efficient frontier
+RISK_TOLERANCE_RANGE = (0.05, 2.0)
+FRONTIER_POINTS = 40
+
+# Monte Carlo portfolio risk: default scenario count and VaR/CVaR level
+SIMULATION_SCENARIOS = 100000
+VAR_CONFIDENCE = 0.95
+
 # Data ranges
 DATA_RANGES = {
     'CO2 Reduction': (100, 1000),
@@ -1,22 +1,78 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 
-def normalize_data(data, columns):
-    """Normalize specified columns to 0-1 range"""
-    result = data.copy()
-    for col in columns:
-        min_val = data[col].min()
-        max_val = data[col].max()
-        result[col] = (data[col] - min_val) / (max_val - min_val)
+from .constants import ESG_WEIGHTS
+
+def column_ranges(data, columns):
+    """Return (mins, maxs) of the given columns as float arrays, ignoring NaNs"""
+    values = data[columns].to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        # All-NaN columns give NaN bounds; they stay NaN after scaling
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+
+def merge_ranges(ranges, other):
+    """Combine (mins, maxs) pairs from two chunks"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.fmin(ranges[0], other[0]), np.fmax(ranges[1], other[1])
+
+def normalize_values(values, mins, maxs):
+    """Min-max scale a 2-D float array in place; zero-range columns become 0"""
+    span = maxs - mins
+    values -= mins
+    values /= np.where(span > 0, span, 1.0)
+    return values
+
+def normalize_data(data, columns, ranges=None, inplace=False):
+    """Normalize specified columns to 0-1 range.
+
+    ranges, as returned by column_ranges, fixes the scaling (e.g. to apply
+    the bounds of a whole file to one chunk of it). With inplace=True the
+    columns of data are overwritten instead of returning a new frame.
+    """
+    values = data[columns].to_numpy(dtype=np.float64, copy=True)
+    mins, maxs = ranges if ranges is not None else column_ranges(data, columns)
+    normalize_values(values, mins, maxs)
+
+    # A shallow copy shares the untouched columns with data
+    result = data if inplace else data.copy(deep=False)
+    result[columns] = values
     return result
 
-def calculate_weighted_score(data, weights):
+def weight_vector(columns, weights=ESG_WEIGHTS):
+    """Weights aligned with columns, 0 for columns without a weight"""
+    return np.array([weights.get(column, 0.0) for column in columns], dtype=np.float64)
+
+def calculate_weighted_score(data, weights=ESG_WEIGHTS):
     """Calculate weighted score based on multiple metrics"""
-    score = 0
-    for col, weight in weights.items():
-        score += data[col] * weight
-    return score
+    columns = list(weights)
+    values = data[columns].to_numpy(dtype=np.float64)
+    return pd.Series(values @ weight_vector(columns, weights), index=data.index)
+
+def score_chunks(read_chunks, weights=ESG_WEIGHTS, normalize=True):
+    """Yield weighted scores for data too large to hold in memory.
+
+    read_chunks() must return a fresh iterator of DataFrame chunks each
+    time it is called: with normalize=True the input is read twice, once
+    for the column bounds and once to score each chunk against them.
+    """
+    columns = list(weights)
+    ranges = None
+    if normalize:
+        for chunk in read_chunks():
+            chunk_ranges = column_ranges(chunk, columns)
+            ranges = chunk_ranges if ranges is None else merge_ranges(ranges, chunk_ranges)
+
+    w = weight_vector(columns, weights)
+    for chunk in read_chunks():
+        values = chunk[columns].to_numpy(dtype=np.float64, copy=True)
+        if ranges is not None:
+            normalize_values(values, *ranges)
+        yield pd.Series(values @ w, index=chunk.index)
 
 def generate_project_names(n):
     """Generate sequential project names"""
-    return [f'Project {i+1}' for i in range(n)]
\ No newline at end of file
+    return [f'Project {i+1}' for i in range(n)]
@@ -0,0 +1,186 @@
+"""Incremental JSON project ingestion.
+
+Reads either a top-level JSON array of records or newline-delimited JSON
+(NDJSON) in fixed-size blocks, decoding one record at a time, so the raw
+file is never held in memory. Only the requested fields are kept, packed
+into typed NumPy column buffers.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .constants import FEATURE_COLUMNS
+
+PROJECT_FIELDS = ['Project Name'] + FEATURE_COLUMNS
+TEXT_FIELDS = ('Project Name',)
+
+# Rough per-value cost of a Python string held in an object array
+STRING_OVERHEAD_BYTES = 56
+
+
+class JSONRecordReader:
+    """Iterate the records of a JSON array or NDJSON file.
+
+    bytes_read and total_bytes are kept up to date for progress reporting.
+    """
+
+    def __init__(self, file_path, read_size=1 << 20):
+        self.file_path = file_path
+        self.read_size = read_size
+        self.total_bytes = os.path.getsize(file_path)
+        self.bytes_read = 0
+        self.decoder = json.JSONDecoder()
+
+    def __iter__(self):
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            buffer = ''
+            pos = 0
+            eof = False
+            in_array = None
+
+            while True:
+                # Skip whitespace and array separators
+                while True:
+                    while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                        pos += 1
+                    if pos < len(buffer) or eof:
+                        break
+                    buffer, pos, eof = self._refill(file, buffer, pos)
+
+                if pos >= len(buffer):
+                    return
+                if in_array is None:
+                    in_array = buffer[pos] == '['
+                    if in_array:
+                        pos += 1
+                        continue
+                if in_array and buffer[pos] == ']':
+                    return
+
+                try:
+                    record, end = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    # Record straddles the block boundary; read more and retry
+                    buffer, pos, eof = self._refill(file, buffer, pos)
+                    continue
+                pos = end
+                yield record
+
+    def _refill(self, file, buffer, pos):
+        block = file.read(self.read_size)
+        self.bytes_read += len(block.encode('utf-8')) if block else 0
+        return buffer[pos:] + block, 0, not block
+
+
+class ColumnBuffer:
+    """Growable typed array for one field.
+
+    The dtype is inferred from the first batch (int64, float64, bool or
+    object for text) and widened to float64 or object if later batches
+    need it.
+    """
+
+    def __init__(self, text=False):
+        self.text = text
+        self.array = None
+        self.size = 0
+        self.text_bytes = 0
+
+    def append(self, values):
+        if self.text:
+            batch = np.empty(len(values), dtype=object)
+            batch[:] = values
+            self.text_bytes += sum(len(value) for value in values if isinstance(value, str))
+        else:
+            batch = np.asarray(values)
+            if batch.dtype.kind not in 'biuf':
+                # Missing values (None) or mixed types: fall back to floats
+                batch = np.array(values, dtype=float)
+
+        if self.array is None:
+            self.array = np.empty(max(len(batch), 1), dtype=batch.dtype)
+        dtype = np.result_type(self.array.dtype, batch.dtype)
+        if dtype != self.array.dtype:
+            self.array = self.array.astype(dtype)
+        if self.size + len(batch) > len(self.array):
+            grown = np.empty(max(2 * len(self.array), self.size + len(batch)), dtype=self.array.dtype)
+            grown[:self.size] = self.array[:self.size]
+            self.array = grown
+        self.array[self.size:self.size + len(batch)] = batch
+        self.size += len(batch)
+
+    def nbytes(self):
+        if self.array is None:
+            return 0
+        extra = self.size * STRING_OVERHEAD_BYTES + self.text_bytes if self.text else 0
+        return self.array.nbytes + extra
+
+    def values(self):
+        return self.array[:self.size] if self.array is not None else np.empty(0)
+
+
+def iter_json_batches(file_path, fields=PROJECT_FIELDS, batch_size=50000, reader=None):
+    """Yield (record count, {field: list of values}) batches.
+
+    Fields absent from a batch are omitted, so the count is the only
+    reliable row count for a batch whose records have none of the fields.
+    """
+    reader = reader or JSONRecordReader(file_path)
+    batch = {field: [] for field in fields}
+    seen = set()
+    count = 0
+    for record in reader:
+        if not isinstance(record, dict):
+            raise ValueError("Expected a list of JSON objects")
+        for field in fields:
+            value = record.get(field)
+            if value is not None:
+                seen.add(field)
+            batch[field].append(value)
+        count += 1
+        if count == batch_size:
+            yield count, {field: batch[field] for field in fields if field in seen}
+            batch = {field: [] for field in fields}
+            seen = set()
+            count = 0
+    if count:
+        yield count, {field: batch[field] for field in fields if field in seen}
+
+
+def iter_json_frames(file_path, fields=PROJECT_FIELDS, batch_size=50000):
+    """Yield DataFrame chunks of the given fields"""
+    for count, batch in iter_json_batches(file_path, fields, batch_size):
+        yield pd.DataFrame(batch, index=pd.RangeIndex(count))
+
+
+def read_json_columns(file_path, fields=PROJECT_FIELDS, batch_size=50000,
+                      progress=None, max_bytes=None):
+    """Read the given fields of every record into a DataFrame.
+
+    progress, if given, is called as progress(percent, message) after each
+    batch. A MemoryError is raised as soon as the column buffers would
+    exceed max_bytes.
+    """
+    reader = JSONRecordReader(file_path)
+    buffers = {field: ColumnBuffer(text=field in TEXT_FIELDS) for field in fields}
+    n_records = 0
+    for n_batch, batch in iter_json_batches(file_path, fields, batch_size, reader):
+        for field, buffer in buffers.items():
+            buffer.append(batch.get(field, [None] * n_batch))
+        n_records += n_batch
+
+        used = sum(buffer.nbytes() for buffer in buffers.values())
+        if max_bytes is not None and used > max_bytes:
+            raise MemoryError(
+                f"{file_path}: {n_records:,} records need {used / 1e6:,.1f} MB, "
+                f"over the {max_bytes / 1e6:,.1f} MB limit"
+            )
+        if progress is not None:
+            percent = 100 * reader.bytes_read // max(reader.total_bytes, 1)
+            progress(percent, f"Read {n_records:,} projects")
+
+    return pd.DataFrame({field: buffer.values() for field, buffer in buffers.items()})
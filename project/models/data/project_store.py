@@ -0,0 +1,156 @@
+"""Columnar binary project files (.gfp).
+
+Layout: an 8-byte magic, an 8-byte little-endian manifest length, a JSON
+manifest (settings plus one entry per column) and then one 64-byte aligned
+block per column. Numeric columns are raw little-endian arrays that can be
+memory-mapped in place; text columns are a UTF-8 blob plus int64 end
+offsets. Readers only touch the blocks of the columns they ask for.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'GFPROJ1\n'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+PROJECT_SUFFIX = '.gfp'
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _encode_column(values):
+    """Return (manifest entry, list of byte blocks) for one column"""
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biuf':
+        array = np.ascontiguousarray(values.to_numpy(), dtype=values.dtype.newbyteorder('<'))
+        return {'kind': 'numeric', 'dtype': array.dtype.str}, [array]
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind == 'M':
+        array = np.ascontiguousarray(values.to_numpy()).view('<i8')
+        return {'kind': 'datetime', 'dtype': values.dtype.str}, [array]
+
+    # Everything else is stored as text, with a null mask when needed
+    missing = values.isna().to_numpy()
+    encoded = [b'' if null else str(value).encode('utf-8')
+               for value, null in zip(values.to_numpy(dtype=object), missing)]
+    ends = np.cumsum([len(item) for item in encoded], dtype='<i8')
+    blocks = [np.frombuffer(b''.join(encoded), dtype=np.uint8), ends]
+    entry = {'kind': 'string', 'has_nulls': bool(missing.any())}
+    if entry['has_nulls']:
+        blocks.append(missing.astype(np.uint8))
+    return entry, blocks
+
+
+def save_project_file(file_path, data, settings=None):
+    """Write data and settings to a .gfp file atomically"""
+    columns = []
+    blocks = []
+    offset = 0
+    for name in data.columns:
+        entry, column_blocks = _encode_column(data[name])
+        entry['name'] = str(name)
+        entry['blocks'] = []
+        for block in column_blocks:
+            entry['blocks'].append([offset, block.nbytes])
+            blocks.append((offset, block))
+            offset = _aligned(offset + block.nbytes)
+        columns.append(entry)
+
+    manifest = json.dumps({
+        'version': FORMAT_VERSION,
+        'n_rows': len(data),
+        'settings': settings or {},
+        'columns': columns
+    }).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(manifest))
+
+    tmp_path = Path(f"{file_path}.tmp")
+    with open(tmp_path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(len(manifest).to_bytes(8, 'little'))
+        file.write(manifest)
+        for block_offset, block in blocks:
+            file.seek(data_start + block_offset)
+            file.write(block.tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, file_path)
+
+
+def read_manifest(file_path):
+    """Return (manifest dict, byte offset of the first column block)"""
+    with open(file_path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not a columnar project file")
+        length = int.from_bytes(file.read(8), 'little')
+        manifest = json.loads(file.read(length))
+    if manifest.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported project file version: {manifest.get('version')}")
+    return manifest, _aligned(len(MAGIC) + 8 + length)
+
+
+def _read_block(file_path, data_start, block, dtype, count, mmap):
+    offset, nbytes = block
+    if mmap and count:
+        # Copy-on-write mapping: pages load on demand and edits stay in memory
+        return np.memmap(file_path, dtype=dtype, mode='c',
+                         offset=data_start + offset, shape=(count,))
+    with open(file_path, 'rb') as file:
+        file.seek(data_start + offset)
+        return np.frombuffer(file.read(nbytes), dtype=dtype).copy()
+
+
+def load_project_file(file_path, columns=None, mmap=True):
+    """Load (data, settings) from a .gfp file, or from a legacy JSON/CSV project.
+
+    columns limits which columns are read; numeric columns of .gfp files
+    are memory-mapped unless mmap is False.
+    """
+    with open(file_path, 'rb') as file:
+        is_columnar = file.read(len(MAGIC)) == MAGIC
+    if not is_columnar:
+        return _load_legacy_project(file_path, columns)
+
+    manifest, data_start = read_manifest(file_path)
+    n_rows = manifest['n_rows']
+    wanted = None if columns is None else set(columns)
+
+    result = {}
+    for entry in manifest['columns']:
+        if wanted is not None and entry['name'] not in wanted:
+            continue
+        blocks = entry['blocks']
+        if entry['kind'] == 'numeric':
+            values = _read_block(file_path, data_start, blocks[0], entry['dtype'], n_rows, mmap)
+        elif entry['kind'] == 'datetime':
+            values = _read_block(file_path, data_start, blocks[0], '<i8', n_rows, False)
+            values = values.view(entry['dtype'])
+        else:
+            blob = _read_block(file_path, data_start, blocks[0], np.uint8, blocks[0][1], False).tobytes()
+            ends = _read_block(file_path, data_start, blocks[1], '<i8', n_rows, False)
+            starts = np.concatenate(([0], ends[:-1]))
+            values = np.array([blob[start:end].decode('utf-8')
+                               for start, end in zip(starts.tolist(), ends.tolist())],
+                              dtype=object)
+            if entry.get('has_nulls'):
+                nulls = _read_block(file_path, data_start, blocks[2], np.uint8, n_rows, False)
+                values[nulls.astype(bool)] = None
+        result[entry['name']] = values
+
+    data = pd.DataFrame(result, copy=False)
+    return data, manifest.get('settings', {})
+
+
+def _load_legacy_project(file_path, columns=None):
+    """Import the older pretty-printed JSON projects, or a plain CSV"""
+    if str(file_path).lower().endswith('.csv'):
+        return pd.read_csv(file_path, usecols=columns), {}
+    with open(file_path, 'r') as file:
+        payload = json.load(file)
+    data = pd.DataFrame(payload['project_data']).reset_index(drop=True)
+    if columns is not None:
+        data = data[[column for column in columns if column in data.columns]]
+    return data, payload.get('settings', {})
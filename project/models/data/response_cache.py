@@ -0,0 +1,104 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path.home() / '.green_finance_ai' / 'http_cache.sqlite'
+
+
+class ResponseCache:
+    """Persistent HTTP response store in a single SQLite file.
+
+    Entries keep the raw body together with the validators (ETag and
+    Last-Modified) needed for conditional revalidation. Once the stored
+    bodies exceed ``max_bytes`` the least recently read entries are
+    dropped. Freshness policy (TTLs) is left to the caller.
+    """
+
+    def __init__(self, path=None, max_bytes=64 * 1024 ** 2):
+        self.path = Path(path or os.environ.get('GFAI_HTTP_CACHE', DEFAULT_CACHE_PATH))
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the cache usable from any thread
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(url, params=None):
+        return url + '?' + json.dumps(params or {}, sort_keys=True)
+
+    def get(self, key):
+        """Return the entry for key as a dict, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        body, etag, last_modified, fetched_at = row
+        return {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at
+        }
+
+    def put(self, key, url, body, etag=None, last_modified=None):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, body, etag, last_modified, now, now, len(body))
+            )
+        self.evict()
+
+    def touch(self, key):
+        """Mark an entry fresh again after a 304 Not Modified"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key)
+            )
+
+    def evict(self):
+        """Drop least recently read entries until the bodies fit in max_bytes"""
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for key, size in conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
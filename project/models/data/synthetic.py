@@ -0,0 +1,156 @@
+"""Seeded synthetic project data for demos and load tests.
+
+Usage (from the project directory):
+    python -m models.data.synthetic projects.csv --rows 10000000 --correlation 0.3
+"""
+import argparse
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+from .constants import DATA_RANGES, DEFAULT_PROJECT_COUNT, FEATURE_COLUMNS
+
+# Rows drawn per random stream; output does not depend on the chunk size
+BLOCK_ROWS = 1 << 16
+
+INTEGER_COLUMNS = ('Job Creation',)
+
+
+class SyntheticProjectGenerator:
+    """Projects with each metric drawn from its DATA_RANGES interval.
+
+    Uses its own seeded np.random.Generator per block of rows, never the
+    global NumPy state. correlation is either one coefficient shared by
+    every pair of metrics or a full matrix in FEATURE_COLUMNS order; the
+    metrics are then drawn through a Gaussian copula, so each keeps its
+    uniform marginal. A fraction of rows can be made outliers by pushing
+    one metric outside its range by about outlier_scale range widths.
+    """
+
+    def __init__(self, seed=42, correlation=None, outlier_fraction=0.0, outlier_scale=3.0):
+        self.seed = seed
+        self.outlier_fraction = outlier_fraction
+        self.outlier_scale = outlier_scale
+        ranges = [DATA_RANGES[column.replace(' (M)', '')] for column in FEATURE_COLUMNS]
+        self.low = np.array([low for low, _ in ranges], dtype=float)
+        self.width = np.array([high - low for low, high in ranges], dtype=float)
+
+        self.cholesky = None
+        if correlation is not None:
+            k = len(FEATURE_COLUMNS)
+            matrix = np.asarray(correlation, dtype=float)
+            if matrix.ndim == 0:
+                matrix = np.full((k, k), float(matrix))
+                np.fill_diagonal(matrix, 1.0)
+            try:
+                self.cholesky = np.linalg.cholesky(matrix)
+            except np.linalg.LinAlgError as e:
+                raise ValueError("Correlation matrix must be positive definite") from e
+
+    def block(self, index):
+        """All BLOCK_ROWS rows of one block as a float array in FEATURE_COLUMNS order"""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(index,)))
+        k = len(FEATURE_COLUMNS)
+        if self.cholesky is None:
+            unit = rng.random((BLOCK_ROWS, k))
+        else:
+            unit = ndtr(rng.standard_normal((BLOCK_ROWS, k)) @ self.cholesky.T)
+        values = self.low + unit * self.width
+
+        if self.outlier_fraction > 0:
+            rows = np.flatnonzero(rng.random(BLOCK_ROWS) < self.outlier_fraction)
+            columns = rng.integers(0, k, len(rows))
+            distance = self.width[columns] * self.outlier_scale * rng.uniform(0.5, 1.5, len(rows))
+            below = rng.random(len(rows)) < 0.5
+            values[rows, columns] = np.where(
+                below,
+                self.low[columns] - distance,
+                self.low[columns] + self.width[columns] + distance
+            )
+        return values
+
+    def generate(self, n=DEFAULT_PROJECT_COUNT, start=0):
+        """Rows start .. start + n as a DataFrame"""
+        parts = []
+        row = start
+        while row < start + n:
+            index, offset = divmod(row, BLOCK_ROWS)
+            take = min(BLOCK_ROWS - offset, start + n - row)
+            parts.append(self.block(index)[offset:offset + take])
+            row += take
+        values = np.concatenate(parts) if parts else np.empty((0, len(FEATURE_COLUMNS)))
+
+        data = {'Project Name': [f'Project {i + 1}' for i in range(start, start + n)]}
+        for i, column in enumerate(FEATURE_COLUMNS):
+            data[column] = values[:, i]
+        for column in INTEGER_COLUMNS:
+            # Matches randint's half-open [low, high) interval
+            data[column] = np.floor(data[column]).astype(np.int64)
+        return pd.DataFrame(data)
+
+    def iter_chunks(self, n, chunk_size=BLOCK_ROWS):
+        for start in range(0, n, chunk_size):
+            yield self.generate(min(chunk_size, n - start), start)
+
+    def write(self, path, n, chunk_size=BLOCK_ROWS, progress=None):
+        """Stream n rows to a .csv or .parquet file without holding them all in memory"""
+        suffix = Path(path).suffix.lower()
+        if suffix not in ('.csv', '.parquet'):
+            raise ValueError(f"Unsupported output format: {suffix}")
+
+        writer = None
+        if suffix == '.parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Writing Parquet requires pyarrow") from e
+
+        written = 0
+        try:
+            with open(path, 'w', newline='') if suffix == '.csv' else nullcontext() as file:
+                for chunk in self.iter_chunks(n, chunk_size):
+                    if suffix == '.csv':
+                        chunk.to_csv(file, header=(written == 0), index=False)
+                    else:
+                        table = pa.Table.from_pandas(chunk, preserve_index=False)
+                        if writer is None:
+                            writer = pq.ParquetWriter(path, table.schema)
+                        writer.write_table(table)
+                    written += len(chunk)
+                    if progress is not None:
+                        progress(100 * written // max(n, 1), f"Wrote {written:,} projects")
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic ESG projects")
+    parser.add_argument('output', help=".csv or .parquet file to write")
+    parser.add_argument('--rows', type=int, default=DEFAULT_PROJECT_COUNT)
+    parser.add_argument('--chunk-size', type=int, default=BLOCK_ROWS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--correlation', type=float,
+                        help="correlation shared by every pair of metrics")
+    parser.add_argument('--outliers', type=float, default=0.0,
+                        help="fraction of rows with one out-of-range metric")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticProjectGenerator(args.seed, args.correlation, args.outliers)
+    try:
+        written = generator.write(args.output, args.rows, args.chunk_size)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {written:,} projects to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Lightweight stage timing for the evaluation pipeline.
+
+Wrap a stage in ``with span('esg.train'):`` or decorate a function with
+``@timed('esg.train')``. While tracing is disabled both cost one attribute
+check; once enabled every span is kept as a Chrome trace event and feeds
+rolling per-stage statistics. Tracing starts enabled when GFAI_TRACE=1.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Durations kept per stage for the rolling statistics
+ROLLING_WINDOW = 200
+# Trace events kept for export; the oldest are dropped first
+MAX_EVENTS = 100000
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, category):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.category, self.start, time.perf_counter())
+        return False
+
+
+class Tracer:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.durations = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def span(self, name, category='pipeline'):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category)
+
+    def timed(self, name=None, category='pipeline'):
+        """Decorator timing each call of the function as one span"""
+        def decorate(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(label, category, start, time.perf_counter())
+            return wrapper
+        return decorate
+
+    def record(self, name, category, start, end):
+        with self.lock:
+            self.events.append((name, category, start, end - start, threading.get_ident()))
+            self.durations.setdefault(name, deque(maxlen=ROLLING_WINDOW)).append(end - start)
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def stats(self):
+        """{stage: count, last, mean, p50, p95 and max seconds over the rolling window}"""
+        with self.lock:
+            snapshot = {name: list(values) for name, values in self.durations.items()}
+            counts = dict(self.counts)
+        result = {}
+        for name, values in snapshot.items():
+            ordered = sorted(values)
+            result[name] = {
+                'count': counts[name],
+                'last': values[-1],
+                'mean': sum(values) / len(values),
+                'p50': ordered[len(ordered) // 2],
+                'p95': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                'max': ordered[-1]
+            }
+        return result
+
+    def export_chrome_trace(self, file_path):
+        """Write the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        with self.lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = [{
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self.origin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': thread_id
+        } for name, category, start, duration, thread_id in events]
+        with open(file_path, 'w') as file:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, file)
+        return len(trace)
+
+    def clear(self):
+        with self.lock:
+            self.events.clear()
+            self.durations.clear()
+            self.counts.clear()
+
+
+tracer = Tracer(enabled=os.environ.get('GFAI_TRACE') == '1')
+span = tracer.span
+timed = tracer.timed
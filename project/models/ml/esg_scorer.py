@@ -1,30 +1,186 @@
+import os
+
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from joblib import Parallel, delayed, effective_n_jobs, parallel_config
+from sklearn.ensemble import (RandomForestRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingRegressor)
 from sklearn.neural_network import MLPRegressor
 from sklearn.preprocessing import StandardScaler
+from .feature_store import standardize
+from ..data.constants import ESG_LARGE_N_THRESHOLD
+from ..instrumentation import span, timed
+
+PROFILES = ('auto', 'classic', 'large')
+# Rows each tree of the 'large' forest is grown on
+LARGE_RF_MAX_SAMPLES = 100000
+# Fewer training rows than this leave too small a validation split for early stopping
+LARGE_EARLY_STOPPING_MIN_ROWS = 1000
+
+def _fit_model(model, X, y, n_jobs=None):
+    # n_jobs reaches estimators that support it (the random forest) through
+    # the joblib context; prediction stays outside it so tree outputs are
+    # always summed in the same order
+    with parallel_config(n_jobs=n_jobs):
+        return model.fit(X, y)
+
+def _predict_model(model, X):
+    return model.predict(X)
+
+def build_models(profile, n_rows=None):
+    """(random forest, gradient boosting, neural network) for a backend profile"""
+    if profile == 'classic':
+        return (
+            RandomForestRegressor(n_estimators=100, random_state=42),
+            GradientBoostingRegressor(n_estimators=100, random_state=42),
+            MLPRegressor(hidden_layer_sizes=(100, 50), random_state=42)
+        )
+    max_samples = LARGE_RF_MAX_SAMPLES if n_rows is None else min(LARGE_RF_MAX_SAMPLES, n_rows)
+    early_stopping = n_rows is None or n_rows >= LARGE_EARLY_STOPPING_MIN_ROWS
+    return (
+        RandomForestRegressor(n_estimators=50, max_depth=12, min_samples_leaf=5,
+                              max_samples=max_samples, random_state=42),
+        HistGradientBoostingRegressor(max_iter=200, early_stopping=early_stopping,
+                                      n_iter_no_change=10, random_state=42),
+        MLPRegressor(hidden_layer_sizes=(100, 50), batch_size=2048, max_iter=50,
+                     early_stopping=early_stopping, n_iter_no_change=5, random_state=42)
+    )
 
 class ESGScorer:
-    def __init__(self):
-        self.rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.gb_model = GradientBoostingRegressor(n_estimators=100, random_state=42)
-        self.nn_model = MLPRegressor(hidden_layer_sizes=(100, 50), random_state=42)
+    """Ensemble ESG score: mean of a random forest, gradient boosting and an MLP.
+
+    profile chooses the estimators:
+      'classic'  full-depth forest, exact GradientBoostingRegressor and an
+                 MLP trained for up to 200 epochs; cost grows steeply with n.
+      'large'    forest of 50 depth-12 trees, each on at most
+                 LARGE_RF_MAX_SAMPLES rows; HistGradientBoostingRegressor
+                 (binned features) with early stopping; MLP on 2048-row
+                 batches with early stopping (off below
+                 LARGE_EARLY_STOPPING_MIN_ROWS). Slightly less accurate on
+                 small data, but training time grows roughly linearly.
+      'auto'     'large' above ESG_LARGE_N_THRESHOLD training rows, else
+                 'classic'.
+    The default comes from GFAI_ESG_PROFILE, falling back to 'auto'.
+    benchmarks/esg_profiles.py measures the accuracy/throughput trade-off.
+    """
+
+    def __init__(self, cache=None, n_jobs=None, parallel_min_rows=5000, feature_store=None,
+                 profile=None):
+        self.profile = profile or os.environ.get('GFAI_ESG_PROFILE', 'auto')
+        if self.profile not in PROFILES:
+            raise ValueError(f"Unknown ESG model profile: {self.profile}")
+        # Profile of the current models; 'auto' is resolved when training
+        self.active_profile = 'large' if self.profile == 'large' else 'classic'
+        self.rf_model, self.gb_model, self.nn_model = build_models(self.active_profile)
         self.scaler = StandardScaler()
+        # Optional ModelCache; when set, fitted models are reused across runs
+        self.cache = cache
+        self.model_key = None
+        # Worker count for fitting/predicting the members concurrently;
+        # None or 1 keeps everything sequential. Small inputs are not worth
+        # the process start-up cost.
+        self.n_jobs = n_jobs
+        self.parallel_min_rows = parallel_min_rows
+        # Optional FeatureStore shared with the other models
+        self.feature_store = feature_store
         
-    def prepare_features(self, data):
-        features = data[[
+    @timed('esg.prepare_features')
+    def prepare_features(self, data, fit=True):
+        columns = [
             'CO2 Reduction', 'Energy Savings', 
             'Social Impact', 'Governance Score',
             'Job Creation', 'Investment (M)'
-        ]]
-        return self.scaler.fit_transform(features)
+        ]
+        # fit=False reuses the scaling learned from the training data
+        if not fit:
+            return self.scaler.transform(data[columns])
+        features, self.scaler = standardize(self.feature_store, data, columns)
+        return features
+        
+    def models(self):
+        return [self.rf_model, self.gb_model, self.nn_model]
         
+    def resolve_profile(self, n_rows):
+        if self.profile != 'auto':
+            return self.profile
+        return 'large' if n_rows > ESG_LARGE_N_THRESHOLD else 'classic'
+        
+    def model_params(self):
+        # n_jobs does not change the fitted models, so keep it out of the cache key
+        return {
+            name: {k: v for k, v in model.get_params().items() if k != 'n_jobs'}
+            for name, model in zip(['rf', 'gb', 'nn'], self.models())
+        }
+        
+    def worker_count(self, n_rows):
+        if self.n_jobs in (None, 1) or n_rows < self.parallel_min_rows:
+            return 1
+        return effective_n_jobs(self.n_jobs)
+        
+    @timed('esg.train_models')
     def train_models(self, X, y):
-        self.rf_model.fit(X, y)
-        self.gb_model.fit(X, y)
-        self.nn_model.fit(X, y)
+        # Fresh estimators for this row count; their parameters go into the cache key
+        self.active_profile = self.resolve_profile(len(X))
+        self.rf_model, self.gb_model, self.nn_model = build_models(self.active_profile, len(X))
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(X, y, self.model_params(), self.scaler)
+            if self.load_models(key):
+                return key
+
+        n_jobs = self.worker_count(len(X))
+        if n_jobs == 1:
+            with span('esg.fit.rf'):
+                self.rf_model.fit(X, y)
+            with span('esg.fit.gb'):
+                self.gb_model.fit(X, y)
+            with span('esg.fit.nn'):
+                self.nn_model.fit(X, y)
+        else:
+            # One process per member; cores left over go to the forest's trees
+            self.rf_model, self.gb_model, self.nn_model = Parallel(n_jobs=min(n_jobs, 3))(
+                delayed(_fit_model)(model, X, y, n_jobs=max(1, n_jobs - 2) if i == 0 else None)
+                for i, model in enumerate(self.models())
+            )
+
+        if self.cache is not None:
+            self.cache.save(key, {
+                'profile': self.active_profile,
+                'scaler': self.scaler,
+                'rf_model': self.rf_model,
+                'gb_model': self.gb_model,
+                'nn_model': self.nn_model
+            })
+        self.model_key = key
+        return key
+        
+    def load_models(self, key):
+        """Restore fitted models and scaler from the cache for predict-only use"""
+        artifact = self.cache.load(key) if self.cache is not None else None
+        if artifact is None:
+            return False
+        self.active_profile = artifact.get('profile', 'classic')
+        self.scaler = artifact['scaler']
+        self.rf_model = artifact['rf_model']
+        self.gb_model = artifact['gb_model']
+        self.nn_model = artifact['nn_model']
+        self.model_key = key
+        return True
         
+    @timed('esg.predict_ensemble')
     def predict_ensemble(self, X):
-        rf_pred = self.rf_model.predict(X)
-        gb_pred = self.gb_model.predict(X)
-        nn_pred = self.nn_model.predict(X)
-        return np.mean([rf_pred, gb_pred, nn_pred], axis=0)
\ No newline at end of file
+        n_jobs = self.worker_count(len(X))
+        if n_jobs == 1:
+            with span('esg.predict.rf'):
+                rf_pred = self.rf_model.predict(X)
+            with span('esg.predict.gb'):
+                gb_pred = self.gb_model.predict(X)
+            with span('esg.predict.nn'):
+                nn_pred = self.nn_model.predict(X)
+        else:
+            # Threads avoid pickling the fitted models; tree traversal and
+            # BLAS both release the GIL
+            rf_pred, gb_pred, nn_pred = Parallel(n_jobs=min(n_jobs, 3), prefer='threads')(
+                delayed(_predict_model)(model, X) for model in self.models()
+            )
+        return np.mean([rf_pred, gb_pred, nn_pred], axis=0)
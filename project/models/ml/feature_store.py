@@ -0,0 +1,86 @@
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from ..data.constants import FEATURE_COLUMNS
+
+
+class FeatureStore:
+    """Standardised feature columns shared by the ESG, risk and portfolio models.
+
+    The mean, standard deviation and standardised values of every feature
+    column are computed once per dataset into one C-contiguous float64
+    matrix, instead of each model refitting a StandardScaler on the same
+    columns. The store follows whichever DataFrame it was last asked
+    about; passing row hashes to refresh() also catches in-place edits.
+    """
+
+    def __init__(self, columns=FEATURE_COLUMNS):
+        self.columns = list(columns)
+        self.positions = {column: i for i, column in enumerate(self.columns)}
+        self.data = None
+        self.hashes = None
+        self.matrix = None
+        self.mean = None
+        self.var = None
+        self.scale = None
+
+    def refresh(self, data, hashes=None):
+        """Recompute if data is a new object or its row hashes changed"""
+        if data is self.data:
+            if hashes is None or self.hashes is None:
+                self.hashes = hashes if hashes is not None else self.hashes
+                return
+            if np.array_equal(hashes, self.hashes):
+                return
+
+        values = data[self.columns].to_numpy(dtype=np.float64, copy=True)
+        self.mean = values.mean(axis=0)
+        self.var = values.var(axis=0)
+        # Constant columns are left unscaled, as StandardScaler does
+        self.scale = np.where(self.var > 0, np.sqrt(self.var), 1.0)
+        values -= self.mean
+        values /= self.scale
+        self.matrix = np.ascontiguousarray(values)
+        self.data = data
+        self.hashes = hashes
+
+    def invalidate(self):
+        self.data = None
+        self.hashes = None
+        self.matrix = None
+
+    def covers(self, data, columns):
+        return all(column in self.positions for column in columns) and \
+            all(column in data.columns for column in self.columns)
+
+    def features(self, columns):
+        """Standardised values of columns; a view when they are adjacent in the store"""
+        positions = [self.positions[column] for column in columns]
+        if positions == list(range(positions[0], positions[0] + len(positions))):
+            return self.matrix[:, positions[0]:positions[0] + len(positions)]
+        return self.matrix[:, positions]
+
+    def scaler(self, columns):
+        """A StandardScaler fitted with the stored statistics, for fit=False scoring"""
+        positions = [self.positions[column] for column in columns]
+        scaler = StandardScaler()
+        scaler.mean_ = self.mean[positions].copy()
+        scaler.var_ = self.var[positions].copy()
+        scaler.scale_ = self.scale[positions].copy()
+        scaler.n_features_in_ = len(positions)
+        scaler.n_samples_seen_ = np.int64(len(self.matrix))
+        scaler.feature_names_in_ = np.array(columns, dtype=object)
+        return scaler
+
+    def standardize(self, data, columns):
+        """Return (standardised columns of data, scaler fitted on them)"""
+        self.refresh(data)
+        return self.features(columns), self.scaler(columns)
+
+
+def standardize(store, data, columns):
+    """Fit-path standardisation, read from store when one is given and covers the columns"""
+    if store is not None and store.covers(data, columns):
+        return store.standardize(data, columns)
+    scaler = StandardScaler()
+    return scaler.fit_transform(data[columns]), scaler
@@ -0,0 +1,89 @@
+import hashlib
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import sklearn
+
+# Bump when the artifact layout changes so stale files are never loaded
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / '.green_finance_ai' / 'model_cache'
+
+
+class ModelCache:
+    """On-disk store of fitted models keyed by training data and hyperparameters.
+
+    Artifacts are evicted least-recently-used first once the cache holds more
+    than ``max_entries`` files or more than ``max_bytes`` in total.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=20, max_bytes=512 * 1024 ** 2):
+        self.cache_dir = Path(cache_dir or os.environ.get('GFAI_MODEL_CACHE', DEFAULT_CACHE_DIR))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def make_key(self, X, y, params, scaler=None):
+        """Hash training data, hyperparameters and library versions into a cache key"""
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_FORMAT_VERSION}-sklearn{sklearn.__version__}".encode())
+        for array in (X, y):
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.data)
+        if scaler is not None and hasattr(scaler, 'mean_'):
+            digest.update(np.ascontiguousarray(scaler.mean_).data)
+            digest.update(np.ascontiguousarray(scaler.scale_).data)
+        digest.update(repr(sorted(params.items())).encode())
+        return digest.hexdigest()[:32]
+
+    def path_for(self, key):
+        return self.cache_dir / f"{key}.joblib"
+
+    def load(self, key):
+        """Return the cached artifact for key, or None on a miss"""
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            artifact = joblib.load(path)
+        except Exception as e:
+            print(f"Discarding unreadable model cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if artifact.get('version') != CACHE_FORMAT_VERSION:
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mark as recently used
+        return artifact
+
+    def save(self, key, artifact):
+        """Write an artifact atomically, then evict old entries"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = path.with_suffix('.tmp')
+        joblib.dump(dict(artifact, version=CACHE_FORMAT_VERSION), tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Remove least recently used artifacts beyond the entry and size limits"""
+        entries = sorted(
+            (path.stat().st_mtime, path.stat().st_size, path)
+            for path in self.cache_dir.glob('*.joblib')
+        )
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            count -= 1
+
+    def clear(self):
+        for path in self.cache_dir.glob('*.joblib'):
+            path.unlink(missing_ok=True)
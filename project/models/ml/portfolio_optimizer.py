@@ -1,55 +1,212 @@
 import numpy as np
-from scipy.optimize import minimize
+from scipy.optimize import Bounds, linprog, minimize
 from sklearn.preprocessing import StandardScaler
+from ..data.constants import RISK_TOLERANCE_RANGE, FRONTIER_POINTS
+from .feature_store import standardize
+from ..instrumentation import timed
+
+METHODS = ('auto', 'linprog', 'slsqp', 'trust-constr')
+NONLINEAR_METHODS = ('slsqp', 'trust-constr')
 
 class PortfolioOptimizer:
-    def __init__(self):
+    def __init__(self, feature_store=None):
+        self.feature_store = feature_store
         self.scaler = StandardScaler()
+        self.column_scalers = {}
         
-    def optimize(self, data, risk_tolerance=0.5):
+    @timed('portfolio.optimize')
+    def optimize(self, data, risk_tolerance=0.5, method='auto'):
         returns = self.calculate_expected_returns(data)
         risks = self.calculate_risks(data)
+        return self.solve(returns, risks, risk_tolerance, method)
+    
+    def solve(self, returns, risks, risk_tolerance=0.5, method='auto', initial_weights=None):
+        """Find portfolio weights for precomputed returns and risks.
+
+        method is 'linprog', 'slsqp', 'trust-constr' or 'auto', which uses the
+        LP solver whenever the objective and risk constraint are the linear
+        ones defined here and the gradient-based path otherwise.
+        """
+        returns = np.asarray(returns, dtype=float)
+        risks = np.asarray(risks, dtype=float)
+        method = self.resolve_method(method)
+        if method == 'linprog':
+            return self.solve_linear(returns, risks, risk_tolerance)
+        return self.solve_nonlinear(returns, risks, risk_tolerance, method, initial_weights)
+    
+    def resolve_method(self, method):
+        if method not in METHODS:
+            raise ValueError(f"Unknown optimization method: {method}")
+        if method == 'auto':
+            return 'linprog' if self.is_linear() else 'slsqp'
+        return method
+    
+    def is_linear(self):
+        # Subclasses overriding the objective or risk measure need the general solver
+        cls = type(self)
+        return (cls.objective_function is PortfolioOptimizer.objective_function
+                and cls.portfolio_risk is PortfolioOptimizer.portfolio_risk)
+    
+    def pareto_front(self, values, risks):
+        """Indices of projects not beaten on both risk and value by another"""
+        order = np.argsort(risks, kind='stable')
+        best_value = np.maximum.accumulate(values[order])
+        on_front = np.ones(len(order), dtype=bool)
+        on_front[1:] = best_value[1:] > best_value[:-1]
+        return order[on_front], order[0]
+    
+    @timed('portfolio.solve_linear')
+    def solve_linear(self, returns, risks, risk_tolerance, front=None):
         n_assets = len(returns)
+        gains = returns - risks / risk_tolerance
         
-        # Optimization constraints
+        # With only the budget and risk constraints an optimal portfolio holds
+        # at most two projects, and never one beaten on both risk and gain by
+        # another, so the LP only needs the risk/gain Pareto front
+        if front is None:
+            front = self.pareto_front(gains, risks)
+        candidates, least_risky = front
+        
+        result = linprog(
+            -gains[candidates],
+            A_ub=risks[candidates][np.newaxis, :], b_ub=[risk_tolerance],
+            A_eq=np.ones((1, len(candidates))), b_eq=[1],
+            bounds=(0, 1),
+            method='highs'
+        )
+        
+        weights = np.zeros(n_assets)
+        if result.status == 2:
+            # No portfolio meets the tolerance; fall back to the least risky project
+            weights[least_risky] = 1.0
+        elif not result.success:
+            raise ValueError(f"Portfolio optimization failed: {result.message}")
+        else:
+            weights[candidates] = result.x
+        return weights
+    
+    @timed('portfolio.efficient_frontier')
+    def efficient_frontier(self, data, tolerances=None, method='auto', progress=None):
+        """Solve the portfolio for a whole grid of risk tolerances at once.
+
+        Features are computed once for the grid. The LP path sorts the
+        projects once, since the risk/return Pareto front contains the
+        risk/gain front for every positive tolerance; the gradient path
+        warm-starts each point from its neighbour's solution. progress, if
+        given, is called as progress(percent, message) after each point.
+        """
+        if tolerances is None:
+            tolerances = np.linspace(*RISK_TOLERANCE_RANGE, FRONTIER_POINTS)
+        tolerances = np.sort(np.asarray(tolerances, dtype=float))
+        returns = self.calculate_expected_returns(data)
+        risks = self.calculate_risks(data)
+        method = self.resolve_method(method)
+        
+        front = self.pareto_front(returns, risks) if method == 'linprog' else None
+        weights = np.empty((len(tolerances), len(returns)))
+        previous = None
+        for i, risk_tolerance in enumerate(tolerances):
+            if method == 'linprog':
+                weights[i] = self.solve_linear(returns, risks, risk_tolerance, front)
+            else:
+                weights[i] = self.solve_nonlinear(returns, risks, risk_tolerance, method, previous)
+            previous = weights[i]
+            if progress is not None:
+                progress(10 + 90 * i // len(tolerances),
+                         f"Solving frontier point {i + 1}/{len(tolerances)}")
+        
+        return {
+            'tolerance': tolerances,
+            'weights': weights,
+            'return': weights @ returns,
+            'risk': weights @ risks,
+            'project_returns': returns,
+            'project_risks': risks
+        }
+    
+    def frontier_weights(self, frontier, risk_tolerance):
+        """Interpolate weights between precomputed frontier points.
+
+        A convex mix of two feasible portfolios stays within the budget and,
+        as risk is linear in the weights, within the interpolated tolerance.
+        """
+        tolerances = frontier['tolerance']
+        risk_tolerance = np.clip(risk_tolerance, tolerances[0], tolerances[-1])
+        upper = min(np.searchsorted(tolerances, risk_tolerance), len(tolerances) - 1)
+        lower = max(upper - 1, 0)
+        if upper == lower or tolerances[upper] == tolerances[lower]:
+            return frontier['weights'][upper]
+        alpha = (risk_tolerance - tolerances[lower]) / (tolerances[upper] - tolerances[lower])
+        return (1 - alpha) * frontier['weights'][lower] + alpha * frontier['weights'][upper]
+    
+    @timed('portfolio.solve_nonlinear')
+    def solve_nonlinear(self, returns, risks, risk_tolerance, method='slsqp', initial_weights=None):
+        if method not in NONLINEAR_METHODS:
+            raise ValueError(f"Unknown nonlinear optimization method: {method}")
+        n_assets = len(returns)
+        
+        # Optimization constraints, with Jacobians so SLSQP does not fall
+        # back to finite differences (one objective call per asset)
         constraints = [
-            {'type': 'eq', 'fun': lambda x: np.sum(x) - 1},  # weights sum to 1
-            {'type': 'ineq', 'fun': lambda x: risk_tolerance - self.portfolio_risk(x, risks)}  # risk constraint
+            {'type': 'eq', 'fun': lambda x: np.sum(x) - 1,
+             'jac': lambda x: np.ones(n_assets)},  # weights sum to 1
+            {'type': 'ineq', 'fun': lambda x: risk_tolerance - self.portfolio_risk(x, risks),
+             'jac': lambda x: -self.portfolio_risk_gradient(x, risks)}  # risk constraint
         ]
-        bounds = tuple((0, 1) for _ in range(n_assets))
+        bounds = Bounds(np.zeros(n_assets), np.ones(n_assets))
         
         # Initial weights
-        initial_weights = np.array([1/n_assets] * n_assets)
+        if initial_weights is None:
+            initial_weights = np.full(n_assets, 1 / n_assets)
         
         # Optimize for maximum ESG impact and returns
         result = minimize(
             lambda x: -self.objective_function(x, returns, risks, risk_tolerance),
             initial_weights,
-            method='SLSQP',
+            jac=lambda x: -self.objective_gradient(x, returns, risks, risk_tolerance),
+            method='trust-constr' if method == 'trust-constr' else 'SLSQP',
             bounds=bounds,
             constraints=constraints
         )
         
         return result.x
     
-    def calculate_expected_returns(self, data):
+    @timed('portfolio.calculate_expected_returns')
+    def calculate_expected_returns(self, data, fit=True):
         # Combine ESG metrics for return estimation
-        metrics = data[[
+        columns = [
             'CO2 Reduction', 'Energy Savings',
             'Social Impact', 'Governance Score'
-        ]]
-        normalized = self.scaler.fit_transform(metrics)
+        ]
+        if not fit:
+            normalized = self.scaler.transform(data[columns])
+        else:
+            normalized, self.scaler = standardize(self.feature_store, data, columns)
         return np.mean(normalized, axis=1)
     
-    def calculate_risks(self, data):
-        investment_size = self.scaler.fit_transform(data[['Investment (M)']])
-        governance_score = self.scaler.fit_transform(data[['Governance Score']])
+    def scale_column(self, data, column, fit=True):
+        # Kept per column so fit=False can score new projects consistently
+        if fit:
+            features, self.column_scalers[column] = standardize(self.feature_store, data, [column])
+            return features
+        return self.column_scalers[column].transform(data[[column]])
+    
+    @timed('portfolio.calculate_risks')
+    def calculate_risks(self, data, fit=True):
+        investment_size = self.scale_column(data, 'Investment (M)', fit)
+        governance_score = self.scale_column(data, 'Governance Score', fit)
         return 1 - np.mean([investment_size, governance_score], axis=0).flatten()
     
     def portfolio_risk(self, weights, risks):
         return np.sum(weights * risks)
     
+    def portfolio_risk_gradient(self, weights, risks):
+        return risks
+    
     def objective_function(self, weights, returns, risks, risk_tolerance):
         portfolio_return = np.sum(weights * returns)
         risk_penalty = self.portfolio_risk(weights, risks) / risk_tolerance
-        return portfolio_return - risk_penalty
\ No newline at end of file
+        return portfolio_return - risk_penalty
+    
+    def objective_gradient(self, weights, returns, risks, risk_tolerance):
+        return returns - self.portfolio_risk_gradient(weights, risks) / risk_tolerance
@@ -1,55 +1,156 @@
 import numpy as np
+from joblib import Parallel, delayed
+from scipy.special import expit
 from sklearn.ensemble import IsolationForest
-from sklearn.covariance import EllipticEnvelope
+from sklearn.covariance import EllipticEnvelope, EmpiricalCovariance
 from sklearn.preprocessing import StandardScaler
+from .feature_store import standardize
+from ..instrumentation import timed
+
+class EmpiricalEnvelope:
+    """Mahalanobis-distance outlier detector on the plain sample covariance.
+
+    A cheaper, non-robust stand-in for EllipticEnvelope: fitting is a
+    single covariance estimate instead of the iterative MCD search.
+    """
+
+    def __init__(self, contamination=0.1):
+        self.contamination = contamination
+        self.covariance = EmpiricalCovariance()
+        self.offset_ = 0.0
+
+    def fit(self, X):
+        self.covariance.fit(X)
+        # Same convention as EllipticEnvelope: negative scores are outliers
+        self.offset_ = np.percentile(-self.covariance.mahalanobis(X), 100 * self.contamination)
+        return self
+
+    def decision_function(self, X):
+        return -self.covariance.mahalanobis(X) - self.offset_
 
 class RiskAnalyzer:
-    def __init__(self):
-        self.isolation_forest = IsolationForest(random_state=42)
-        self.elliptic_envelope = EllipticEnvelope(random_state=42)
+    """Anomaly-based project risk scoring.
+
+    fit() trains the detectors once on reference projects (a random
+    subsample of at most max_fit_samples rows); score() then rates any
+    number of projects against them, in chunks spread over n_jobs threads.
+    covariance picks the elliptic detector: 'mcd' for the robust
+    EllipticEnvelope or 'empirical' for the much cheaper EmpiricalEnvelope.
+    """
+
+    def __init__(self, feature_store=None, covariance='mcd', max_fit_samples=20000,
+                 n_jobs=None, chunk_size=100000, random_state=42):
+        if covariance not in ('mcd', 'empirical'):
+            raise ValueError(f"Unknown covariance estimator: {covariance}")
+        self.feature_store = feature_store
+        self.isolation_forest = IsolationForest(random_state=random_state)
+        if covariance == 'mcd':
+            self.elliptic_envelope = EllipticEnvelope(random_state=random_state)
+        else:
+            self.elliptic_envelope = EmpiricalEnvelope()
         self.scaler = StandardScaler()
-        
-    def analyze_risks(self, data):
-        features = self.prepare_features(data)
-        
-        # Anomaly detection for risk scoring
-        if_scores = self.isolation_forest.fit_predict(features)
-        ee_scores = self.elliptic_envelope.fit_predict(features)
-        
-        # Convert to risk scores (0-1 range)
-        if_risks = self.normalize_risks(if_scores)
-        ee_risks = self.normalize_risks(ee_scores)
-        
+        self.column_scalers = {}
+        self.max_fit_samples = max_fit_samples
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+        # Spread of each detector's scores on the reference data
+        self.score_scales = None
+
+    def analyze_risks(self, data, fit=True):
+        if not fit:
+            return self.score(data)
+        features = self.fit(data)
+        return self.score(data, features)
+
+    @timed('risk.fit')
+    def fit(self, reference):
+        """Fit the detectors and column scalers; returns the standardised reference features"""
+        features = self.prepare_features(reference, fit=True)
+        sample = features
+        if len(features) > self.max_fit_samples:
+            rng = np.random.default_rng(self.random_state)
+            sample = features[np.sort(rng.choice(len(features), self.max_fit_samples, replace=False))]
+
+        self.isolation_forest.fit(sample)
+        self.elliptic_envelope.fit(sample)
+        self.score_scales = [
+            self.score_scale(self.isolation_forest.decision_function(sample)),
+            self.score_scale(self.elliptic_envelope.decision_function(sample))
+        ]
+
+        for column in ('CO2 Reduction', 'Energy Savings', 'Investment (M)', 'Governance Score'):
+            self.scale_column(reference, column, fit=True)
+        return features
+
+    @timed('risk.score')
+    def score(self, data, features=None):
+        """Risk metrics for data against the fitted detectors"""
+        starts = range(0, len(data), self.chunk_size)
+        n_jobs = 1 if len(starts) < 2 or self.n_jobs is None else self.n_jobs
+        parts = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self.score_chunk)(
+                data.iloc[start:start + self.chunk_size],
+                None if features is None else features[start:start + self.chunk_size]
+            )
+            for start in starts
+        )
+        if not parts:
+            return {'risk_score': np.empty(0), 'env_risk': np.empty(0), 'fin_risk': np.empty(0)}
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    def score_chunk(self, data, features=None):
+        if features is None:
+            features = self.prepare_features(data, fit=False)
+
+        # Continuous anomaly scores mapped to 0-1 risks (0.5 at each detector's threshold)
+        if_risks = self.normalize_scores(self.isolation_forest.decision_function(features), self.score_scales[0])
+        ee_risks = self.normalize_scores(self.elliptic_envelope.decision_function(features), self.score_scales[1])
+
         # Environmental risk based on CO2 and Energy metrics
-        env_risks = self.calculate_environmental_risks(data)
-        
+        env_risks = self.calculate_environmental_risks(data, fit=False)
+
         # Financial risk based on investment and returns
-        fin_risks = self.calculate_financial_risks(data)
-        
+        fin_risks = self.calculate_financial_risks(data, fit=False)
+
         return {
-            'risk_score': np.mean([if_risks, ee_risks], axis=0),
+            'risk_score': (if_risks + ee_risks) / 2,
             'env_risk': env_risks,
             'fin_risk': fin_risks
         }
-    
-    def prepare_features(self, data):
-        features = data[[
-            'CO2 Reduction', 'Energy Savings', 
-            'Investment (M)', 'Social Impact', 
+
+    def prepare_features(self, data, fit=True):
+        columns = [
+            'CO2 Reduction', 'Energy Savings',
+            'Investment (M)', 'Social Impact',
             'Governance Score'
-        ]]
-        return self.scaler.fit_transform(features)
-    
-    def normalize_risks(self, scores):
-        # Convert -1/1 predictions to 0-1 risk scores
-        return (scores.max() - scores) / (scores.max() - scores.min())
-    
-    def calculate_environmental_risks(self, data):
-        co2_impact = self.scaler.fit_transform(data[['CO2 Reduction']])
-        energy_impact = self.scaler.fit_transform(data[['Energy Savings']])
+        ]
+        if not fit:
+            return self.scaler.transform(data[columns])
+        features, self.scaler = standardize(self.feature_store, data, columns)
+        return features
+
+    def score_scale(self, scores):
+        scale = np.std(scores)
+        return scale if scale > 0 else 1.0
+
+    def normalize_scores(self, scores, scale):
+        # decision_function is negative for outliers, so low scores mean high risk
+        return expit(-scores / scale)
+
+    def scale_column(self, data, column, fit=True):
+        # One scaler per column so scoring new data can reuse fitted stats
+        if fit:
+            features, self.column_scalers[column] = standardize(self.feature_store, data, [column])
+            return features
+        return self.column_scalers[column].transform(data[[column]])
+
+    def calculate_environmental_risks(self, data, fit=True):
+        co2_impact = self.scale_column(data, 'CO2 Reduction', fit)
+        energy_impact = self.scale_column(data, 'Energy Savings', fit)
         return 1 - np.mean([co2_impact, energy_impact], axis=0).flatten()
-    
-    def calculate_financial_risks(self, data):
-        investment = self.scaler.fit_transform(data[['Investment (M)']])
-        governance = self.scaler.fit_transform(data[['Governance Score']])
-        return 1 - np.mean([investment, governance], axis=0).flatten()
\ No newline at end of file
+
+    def calculate_financial_risks(self, data, fit=True):
+        investment = self.scale_column(data, 'Investment (M)', fit)
+        governance = self.scale_column(data, 'Governance Score', fit)
+        return 1 - np.mean([investment, governance], axis=0).flatten()
@@ -0,0 +1,140 @@
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+
+from ..data.constants import DATA_RANGES, SIMULATION_SCENARIOS, VAR_CONFIDENCE
+
+def _simulate_chunk(seed, n_scenarios, base, volatility, weights, correlation):
+    """Portfolio outcomes (n_scenarios x candidates) for one block of scenarios"""
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_scenarios, len(volatility)), dtype=np.float32)
+    if correlation > 0:
+        # One market-wide factor shared by every project in a scenario
+        common = rng.standard_normal((n_scenarios, 1), dtype=np.float32)
+        shocks *= np.float32(np.sqrt(1 - correlation))
+        shocks += np.float32(np.sqrt(correlation)) * common
+    shocks *= volatility
+    return shocks @ weights.T + base
+
+class RiskSimulator:
+    """Monte Carlo VaR/CVaR for candidate portfolios.
+
+    Each ESG metric behind the expected returns is perturbed by normal
+    noise with a standard deviation of ``uncertainty`` times its width in
+    DATA_RANGES. Because the expected return is linear in the
+    standardised metrics, those perturbations collapse into one return
+    shock per project and scenario, optionally correlated across projects.
+    Scenarios are generated in float32 blocks, spread over ``n_jobs``
+    processes, and every candidate weight vector is evaluated against each
+    block with a single matrix product. Blocks are folded into running
+    sums and a per-candidate tail of the worst losses as they arrive, so
+    the full scenario matrix never exists; blocks in flight plus that tail
+    stay within ``memory_budget``.
+    """
+
+    def __init__(self, uncertainty=0.1, correlation=0.0, confidence=VAR_CONFIDENCE,
+                 memory_budget=256 * 1024 ** 2, n_jobs=None, seed=42):
+        self.uncertainty = uncertainty
+        self.correlation = correlation
+        self.confidence = confidence
+        self.memory_budget = memory_budget
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+    def return_volatility(self, scaler, n_projects):
+        """Per-project return shock std for returns built from scaler's columns"""
+        columns = list(scaler.feature_names_in_)
+        # Project data says 'Investment (M)' where DATA_RANGES says 'Investment'
+        ranges = [DATA_RANGES[column.replace(' (M)', '')] for column in columns]
+        widths = np.array([high - low for low, high in ranges], dtype=float)
+        per_unit = np.sqrt(np.sum((widths / scaler.scale_) ** 2)) / len(columns)
+        return np.broadcast_to(np.asarray(self.uncertainty, dtype=float) * per_unit, (n_projects,))
+
+    def tail_rows(self, n_scenarios):
+        """Worst-loss scenarios kept per candidate for VaR/CVaR"""
+        return max(1, int(np.ceil((1 - self.confidence) * n_scenarios)))
+
+    def chunk_rows(self, n_projects, n_candidates, tail_rows=0):
+        """Scenarios per block so every block in flight and the loss tail fit the budget"""
+        # The tail and its merge buffer, both float32
+        available = self.memory_budget - 8 * tail_rows * n_candidates
+        # Each worker holds shocks and outcomes for its block; the main process
+        # holds one block and its copy in the merge buffer
+        row_bytes = (4 * (n_projects + n_candidates) * effective_n_jobs(self.n_jobs or 1)
+                     + 8 * n_candidates)
+        # Blocks shorter than the tail would make every merge mostly re-partition
+        # it, so a budget too small for the tail is exceeded rather than crawled through
+        return max(1, tail_rows, int(available // row_bytes))
+
+    def simulate(self, returns, volatility, weights, n_scenarios=SIMULATION_SCENARIOS, progress=None):
+        """Outcome statistics for each row of weights (candidates x projects).
+
+        Returns a dict of per-candidate arrays: expected_return, mean, std,
+        var and cvar, where VaR and CVaR are losses (negated outcomes) at
+        the configured confidence. progress, if given, is called as
+        progress(percent, message) after each block.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        base = weights @ np.asarray(returns, dtype=float)
+        volatility = np.ascontiguousarray(volatility, dtype=np.float32)
+        weights32 = np.ascontiguousarray(weights, dtype=np.float32)
+        base32 = base.astype(np.float32)
+
+        tail = self.tail_rows(n_scenarios)
+        rows = self.chunk_rows(len(volatility), len(weights), tail)
+        sizes = [min(rows, n_scenarios - start) for start in range(0, n_scenarios, rows)]
+        # Seeds are tied to blocks, not workers, so results do not depend on n_jobs
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        # Only as many blocks are dispatched as there are workers
+        n_jobs = self.n_jobs or 1
+        blocks = Parallel(n_jobs=n_jobs, return_as='generator', pre_dispatch='n_jobs')(
+            delayed(_simulate_chunk)(seed, size, base32, volatility, weights32, self.correlation)
+            for seed, size in zip(seeds, sizes)
+        )
+        summary = OutcomeSummary(len(weights), tail)
+        for i, block in enumerate(blocks):
+            summary.add(block)
+            if progress is not None:
+                progress(100 * (i + 1) // len(sizes), f"Simulated {summary.count:,} scenarios")
+
+        return dict(expected_return=base, **summary.result())
+
+
+class OutcomeSummary:
+    """Streaming mean, std and worst-loss tail of scenario outcome blocks.
+
+    Sums and sums of squares accumulate in float64. The tail keeps the
+    ``tail`` largest losses per candidate seen so far: each block is
+    appended and partitioned in place.
+    """
+
+    def __init__(self, n_candidates, tail):
+        self.tail_size = tail
+        self.count = 0
+        self.sum = np.zeros(n_candidates)
+        self.sum_squares = np.zeros(n_candidates)
+        self.tail = np.empty((0, n_candidates), dtype=np.float32)
+
+    def add(self, block):
+        """Fold in one (scenarios x candidates) block; the block is overwritten"""
+        self.count += len(block)
+        self.sum += block.sum(axis=0, dtype=np.float64)
+        self.sum_squares += np.einsum('ij,ij->j', block, block, dtype=np.float64)
+
+        # Losses are negated outcomes
+        np.negative(block, out=block)
+        merged = np.concatenate([self.tail, block])
+        del block
+        keep = min(self.tail_size, len(merged))
+        merged.partition(len(merged) - keep, axis=0)
+        self.tail = merged[len(merged) - keep:].copy()
+
+    def result(self):
+        mean = self.sum / self.count
+        variance = np.maximum(self.sum_squares / self.count - mean ** 2, 0.0)
+        return {
+            'mean': mean,
+            'std': np.sqrt(variance),
+            'var': self.tail.min(axis=0).astype(np.float64),
+            'cvar': self.tail.mean(axis=0, dtype=np.float64)
+        }
@@ -1,21 +1,87 @@
 import pandas as pd
 import numpy as np
 import json
+import time
+from contextlib import closing
 from pandas import json_normalize
-from .ml.esg_scorer import ESGScorer
-from .ml.risk_analyzer import RiskAnalyzer
-from .ml.portfolio_optimizer import PortfolioOptimizer
-from .data.esg_data_fetcher import ESGDataFetcher
+from .data.constants import (DRIFT_THRESHOLD, FEATURE_COLUMNS, INCREMENTAL_MAX_FRACTION,
+                             SIMULATION_SCENARIOS)
+from .data.json_stream import JSONRecordReader, PROJECT_FIELDS, read_json_columns
+from .instrumentation import timed
+
+# Ceiling for the column buffers of an imported JSON file
+JSON_MAX_BYTES = 2 * 1024 ** 3
+
+def report_progress(progress, percent, message):
+    """Forward stage progress to an optional progress(percent, message) callback"""
+    if progress is not None:
+        progress(percent, message)
 
 class ProjectEvaluator:
     def __init__(self):
         self.data = None
-        self.esg_scorer = ESGScorer()
-        self.risk_analyzer = RiskAnalyzer()
-        self.portfolio_optimizer = PortfolioOptimizer()
-        self.data_fetcher = ESGDataFetcher()
+        # Models and the fetcher are built on first use: importing
+        # scikit-learn, SciPy and httpx costs more than the whole GUI start
+        self._feature_store = None
+        self._esg_scorer = None
+        self._risk_analyzer = None
+        self._portfolio_optimizer = None
+        self._risk_simulator = None
+        self._data_fetcher = None
+        # Per-stage row hashes, fit-time feature stats and last results,
+        # used to re-score only the projects that changed
+        self.snapshots = {}
+        # Full fits per stage; a snapshot records the fit its results came from
+        self.fits = {}
+
+    @property
+    def feature_store(self):
+        # Standardised features computed once per dataset for all three models
+        if self._feature_store is None:
+            from .ml.feature_store import FeatureStore
+            self._feature_store = FeatureStore()
+        return self._feature_store
+
+    @property
+    def esg_scorer(self):
+        if self._esg_scorer is None:
+            from .ml.esg_scorer import ESGScorer
+            from .ml.model_cache import ModelCache
+            self._esg_scorer = ESGScorer(cache=ModelCache(), n_jobs=-1, feature_store=self.feature_store)
+        return self._esg_scorer
+
+    @property
+    def risk_analyzer(self):
+        if self._risk_analyzer is None:
+            from .ml.risk_analyzer import RiskAnalyzer
+            self._risk_analyzer = RiskAnalyzer(feature_store=self.feature_store, n_jobs=-1)
+        return self._risk_analyzer
 
-    def load_sample_data(self):
+    @property
+    def portfolio_optimizer(self):
+        if self._portfolio_optimizer is None:
+            from .ml.portfolio_optimizer import PortfolioOptimizer
+            self._portfolio_optimizer = PortfolioOptimizer(feature_store=self.feature_store)
+        return self._portfolio_optimizer
+
+    @property
+    def risk_simulator(self):
+        if self._risk_simulator is None:
+            from .ml.risk_simulator import RiskSimulator
+            self._risk_simulator = RiskSimulator(n_jobs=-1)
+        return self._risk_simulator
+
+    @property
+    def data_fetcher(self):
+        if self._data_fetcher is None:
+            from .data.esg_data_fetcher import ESGDataFetcher
+            from .data.response_cache import ResponseCache
+            self._data_fetcher = ESGDataFetcher(cache=ResponseCache())
+        return self._data_fetcher
+
+    @timed('evaluator.load_sample_data')
+    def load_sample_data(self, progress=None):
+        report_progress(progress, 10, "Fetching ESG data")
         self.data = self.data_fetcher.fetch_real_data()
 
     def has_data(self):
@@ -24,24 +90,137 @@ class ProjectEvaluator:
     def get_projects(self):
         return self.data
 
-    def evaluate_projects(self):
+    @timed('evaluator.evaluate_projects')
+    def evaluate_projects(self, progress=None):
         if self.data is None:
             return None
 
+        return self.run_incremental('esg', self.compute_esg_scores, progress)['esg_score']
+
+    def compute_esg_scores(self, data, fit, progress=None):
         # Prepare features and train models
-        X = self.esg_scorer.prepare_features(self.data)
-        y = np.random.random(len(self.data))  # Sample target for training
-        self.esg_scorer.train_models(X, y)
-        
+        report_progress(progress, 10, "Preparing features")
+        X = self.esg_scorer.prepare_features(data, fit)
+        if fit:
+            # Sample target for training; seeded so cached models can be reused
+            y = np.random.default_rng(42).random(len(data))
+            report_progress(progress, 30, "Training ESG models")
+            self.esg_scorer.train_models(X, y)
+
         # Get ensemble predictions
-        return self.esg_scorer.predict_ensemble(X)
+        report_progress(progress, 80, "Predicting ESG scores")
+        return {'esg_score': self.esg_scorer.predict_ensemble(X)}
+
+    @timed('evaluator.feature_hashes')
+    def feature_hashes(self):
+        return pd.util.hash_pandas_object(self.data[FEATURE_COLUMNS], index=False).to_numpy()
+
+    def sync_feature_store(self, hashes=None):
+        """Recompute the shared standardised features if the data was edited in place"""
+        if self._feature_store is None or not self.feature_store.covers(self.data, FEATURE_COLUMNS):
+            return
+        self.feature_store.refresh(self.data, self.feature_hashes() if hashes is None else hashes)
+
+    def feature_stats(self):
+        features = self.data[FEATURE_COLUMNS].to_numpy(dtype=float)
+        return features.mean(axis=0), features.std(axis=0)
+
+    def changed_rows(self, snapshot, hashes):
+        """Positions of rows changed since the snapshot, or None if a full refit is needed"""
+        if snapshot is None or len(hashes) < len(snapshot['hashes']):
+            # Never fitted, or rows were removed and positions no longer line up
+            return None
+        old = snapshot['hashes']
+        changed = np.concatenate([
+            np.flatnonzero(hashes[:len(old)] != old),
+            np.arange(len(old), len(hashes))
+        ])
+        if len(changed) > INCREMENTAL_MAX_FRACTION * len(hashes):
+            return None
+        if len(changed):
+            fit_mean, fit_std = snapshot['stats']
+            mean, _ = self.feature_stats()
+            drift = np.abs(mean - fit_mean) / np.where(fit_std > 0, fit_std, 1)
+            if drift.max() > DRIFT_THRESHOLD:
+                return None
+        return changed
+
+    def run_incremental(self, stage, compute, progress=None):
+        """Run compute(data, fit, progress) -> {name: per-row array}, re-scoring only changed rows"""
+        hashes = self.feature_hashes()
+        # Catch in-place edits before either branch reads the shared features
+        self.sync_feature_store(hashes)
+        snapshot = self.snapshots.get(stage)
+        changed = self.changed_rows(snapshot, hashes)
+        if changed is not None and len(changed) and snapshot.get('fit') != self.fits.get(stage):
+            # The models have since been refitted on another dataset
+            changed = None
+
+        if changed is None:
+            result = compute(self.data, True, progress)
+            self.fits[stage] = self.fits.get(stage, 0) + 1
+            snapshot = {'stats': self.feature_stats(), 'fit': self.fits[stage]}
+        else:
+            report_progress(progress, 50, f"Re-scoring {len(changed):,} changed projects")
+            update = compute(self.data.iloc[changed], False) if len(changed) else {}
+            result = {}
+            for name, previous in snapshot['result'].items():
+                values = np.empty(len(hashes), dtype=previous.dtype)
+                values[:len(previous)] = previous
+                if len(changed):
+                    values[changed] = update[name]
+                result[name] = values
 
-    def optimize_portfolio(self):
+        snapshot['hashes'] = hashes
+        snapshot['result'] = result
+        self.snapshots[stage] = snapshot
+        return {name: values.copy() for name, values in result.items()}
+
+    @timed('evaluator.optimize_portfolio')
+    def optimize_portfolio(self, progress=None):
         if self.data is None:
             return None
             
+        report_progress(progress, 10, "Optimizing portfolio")
+        self.sync_feature_store()
         return self.portfolio_optimizer.optimize(self.data)
 
+    @timed('evaluator.compute_frontier')
+    def compute_frontier(self, progress=None):
+        if self.data is None:
+            return None
+
+        # Reused until a feature changes, e.g. when switching workspace datasets
+        hashes = self.feature_hashes()
+        cached = self.snapshots.get('frontier')
+        if cached is not None and np.array_equal(cached['hashes'], hashes):
+            return cached['result']
+        self.sync_feature_store(hashes)
+        frontier = self.portfolio_optimizer.efficient_frontier(self.data, progress=progress)
+        self.snapshots['frontier'] = {'hashes': hashes, 'result': frontier}
+        return frontier
+
+    @timed('evaluator.simulate_frontier_risk')
+    def simulate_frontier_risk(self, n_scenarios=None, progress=None):
+        """Monte Carlo VaR/CVaR for every point of the efficient frontier"""
+        if self.data is None:
+            return None
+
+        report_progress(progress, 5, "Computing efficient frontier")
+        self.sync_feature_store()
+        frontier = self.portfolio_optimizer.efficient_frontier(self.data)
+        volatility = self.risk_simulator.return_volatility(
+            self.portfolio_optimizer.scaler, len(self.data)
+        )
+        report_progress(progress, 20, "Simulating scenarios")
+        risk = self.risk_simulator.simulate(
+            frontier['project_returns'], volatility, frontier['weights'],
+            n_scenarios or SIMULATION_SCENARIOS,
+            progress=lambda percent, message: report_progress(progress, 20 + percent * 4 // 5, message)
+        )
+        risk['tolerance'] = frontier['tolerance']
+        return risk
+
     def get_expected_returns(self):
         if self.data is None:
             return None
@@ -52,11 +231,12 @@ class ProjectEvaluator:
             return None
         return self.portfolio_optimizer.calculate_risks(self.data)
 
-    def analyze_risks(self):
+    @timed('evaluator.analyze_risks')
+    def analyze_risks(self, progress=None):
         if self.data is None:
             return None
 
-        risk_metrics = self.risk_analyzer.analyze_risks(self.data)
+        risk_metrics = self.run_incremental('risk', self.compute_risks, progress)
         return {
             'project': self.data['Project Name'],
             'risk_score': risk_metrics['risk_score'],
@@ -64,10 +244,24 @@ class ProjectEvaluator:
             'fin_risk': risk_metrics['fin_risk']
         }
 
+    def compute_risks(self, data, fit, progress=None):
+        report_progress(progress, 10, "Detecting anomalous projects")
+        return self.risk_analyzer.analyze_risks(data, fit)
+
     def get_data(self):
         """Returns the data stored in the evaluator."""
         return self.data
 
+    def set_data(self, data):
+        """Replaces the data stored in the evaluator."""
+        self.data = data
+
+    def get_summary_stats(self):
+        """Returns headline statistics for the loaded projects."""
+        if self.data is None:
+            return {}
+        return {'projects': len(self.data)}
+
     def save_data_to_csv(self, file_path):
         """Saves the data to a CSV file."""
         if self.data is not None:
@@ -76,26 +270,30 @@ class ProjectEvaluator:
         else:
             return "No data available to save."
 
-    def set_data_from_json(self, file_path):
+    @timed('evaluator.set_data_from_json')
+    def set_data_from_json(self, file_path, progress=None, max_bytes=JSON_MAX_BYTES):
         """Sets the data from a JSON file."""
         try:
-            # Load data from JSON file
-            with open(file_path, 'r') as file:
-                json_data = json.load(file)
-            
-            # Log the raw JSON data for inspection
-            print("Raw JSON data loaded:", json_data)
+            start = time.perf_counter()
+            # Only the first record is needed; closing the reader releases the file
+            with closing(iter(JSONRecordReader(file_path))) as records:
+                first = next(records, None)
 
-            # Handle cases where JSON is a list of dictionaries
-            if isinstance(json_data, list) and isinstance(json_data[0], dict):
-                # Convert JSON data to DataFrame
-                self.data = pd.DataFrame(json_data)
+            # Handle a JSON array or NDJSON stream of project records
+            if isinstance(first, dict) and any(field in first for field in PROJECT_FIELDS):
+                self.data = read_json_columns(file_path, progress=progress, max_bytes=max_bytes)
+                print(f"Loaded {len(self.data):,} projects with {self.data.shape[1]} columns "
+                      f"from {file_path} in {time.perf_counter() - start:.2f}s")
                 return f"Data loaded from {file_path}"
 
             # Handle nested JSON (try flattening it)
+            with open(file_path, 'r') as file:
+                json_data = json.load(file)
             print("Attempting to normalize JSON structure...")
             normalized_data = json_normalize(json_data)
             self.data = normalized_data
+            print(f"Normalized {normalized_data.shape[0]:,} rows x {normalized_data.shape[1]} columns "
+                  f"from {file_path}")
             return f"Data loaded and normalized from {file_path}"
 
         except Exception as e:
@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from .data.constants import WORKSPACE_MEMORY_BUDGET
+from .data.project_store import PROJECT_SUFFIX, load_project_file, save_project_file
+
+
+def snapshot_bytes(value):
+    """Bytes held by the NumPy arrays inside nested snapshot dicts"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(snapshot_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(snapshot_bytes(item) for item in value)
+    return 0
+
+
+class Workspace:
+    """Named datasets and their derived results, sharing one ProjectEvaluator.
+
+    activate() swaps a dataset into the evaluator together with its
+    snapshots (ESG scores, risks, the efficient frontier), so going back to
+    a dataset reuses everything already computed for it. Datasets other
+    than the active one are kept within memory_budget bytes: the least
+    recently used are spilled to spill_dir (the data as a .gfp file, the
+    snapshots with joblib) and are memory-mapped back in when activated.
+    GFAI_WORKSPACE_BUDGET overrides the default budget.
+    """
+
+    def __init__(self, evaluator, memory_budget=None, spill_dir=None):
+        self.evaluator = evaluator
+        self.memory_budget = memory_budget or int(
+            os.environ.get('GFAI_WORKSPACE_BUDGET', WORKSPACE_MEMORY_BUDGET))
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.owns_spill_dir = spill_dir is None
+        # Least recently used first
+        self.entries = OrderedDict()
+        self.active = None
+
+    def names(self):
+        return list(self.entries)
+
+    def source(self, name):
+        """File the dataset was opened from, if any"""
+        return self.entries[name]['source']
+
+    def set_source(self, name, source):
+        self.entries[name]['source'] = source
+
+    def is_resident(self, name):
+        return not self.entries[name]['spilled']
+
+    def add(self, name, data, source=None, activate=True):
+        if name in self.entries:
+            raise ValueError(f"Dataset already exists: {name}")
+        self.entries[name] = {
+            'id': uuid.uuid4().hex,
+            'data': data,
+            'snapshots': {},
+            'source': source,
+            'spilled': False,
+            'nbytes': 0
+        }
+        self.update_size(name)
+        if activate:
+            return self.activate(name)
+        self.enforce_budget()
+        return data
+
+    def unique_name(self, name):
+        candidate, i = name, 2
+        while candidate in self.entries:
+            candidate = f"{name} ({i})"
+            i += 1
+        return candidate
+
+    def activate(self, name):
+        """Make name the evaluator's dataset; returns its data"""
+        entry = self.entries[name]
+        self.store_active()
+        if entry['spilled']:
+            self.reload(name)
+        self.entries.move_to_end(name)
+        self.active = name
+        self.evaluator.set_data(entry['data'])
+        self.evaluator.snapshots = entry['snapshots']
+        self.enforce_budget()
+        return entry['data']
+
+    def remove(self, name):
+        entry = self.entries.pop(name)
+        if name == self.active:
+            self.active = None
+            self.evaluator.set_data(None)
+            self.evaluator.snapshots = {}
+        if self.spill_dir is not None:
+            for path in self.spill_paths(entry):
+                path.unlink(missing_ok=True)
+
+    def store_active(self):
+        """Take back the active dataset's data and results, which the evaluator may have replaced"""
+        if self.active is None:
+            return
+        entry = self.entries[self.active]
+        entry['data'] = self.evaluator.get_data()
+        entry['snapshots'] = self.evaluator.snapshots
+        self.update_size(self.active)
+
+    def update_size(self, name):
+        entry = self.entries[name]
+        data_bytes = 0 if entry['data'] is None else int(entry['data'].memory_usage(deep=True).sum())
+        entry['nbytes'] = data_bytes + snapshot_bytes(entry['snapshots'])
+
+    def resident_bytes(self):
+        return sum(entry['nbytes'] for entry in self.entries.values() if not entry['spilled'])
+
+    def enforce_budget(self):
+        """Spill least recently used datasets until the resident ones fit the budget"""
+        self.store_active()
+        for name, entry in list(self.entries.items()):
+            if self.resident_bytes() <= self.memory_budget:
+                break
+            if name != self.active and not entry['spilled']:
+                self.spill(name)
+
+    def spill_paths(self, entry):
+        if self.spill_dir is None:
+            self.spill_dir = Path(tempfile.mkdtemp(prefix='gfai_workspace_'))
+        base = self.spill_dir / entry['id']
+        return Path(f"{base}{PROJECT_SUFFIX}"), Path(f"{base}.snapshots.joblib")
+
+    def spill(self, name):
+        entry = self.entries[name]
+        data_path, snapshots_path = self.spill_paths(entry)
+        save_project_file(data_path, entry['data'])
+        # A reloaded entry may still map the old file, so never rewrite it in place
+        tmp_path = Path(f"{snapshots_path}.tmp")
+        joblib.dump(entry['snapshots'], tmp_path)
+        os.replace(tmp_path, snapshots_path)
+        entry.update(data=None, snapshots=None, spilled=True, nbytes=0)
+
+    def reload(self, name):
+        entry = self.entries[name]
+        data_path, snapshots_path = self.spill_paths(entry)
+        # Numeric columns and snapshot arrays come back as copy-on-write maps
+        data, _ = load_project_file(data_path)
+        snapshots = joblib.load(snapshots_path, mmap_mode='c')
+        entry.update(data=data, snapshots=snapshots, spilled=False)
+        self.update_size(name)
+
+    def close(self):
+        """Delete the spill files"""
+        if self.spill_dir is None:
+            return
+        if self.owns_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        else:
+            for entry in self.entries.values():
+                for path in self.spill_paths(entry):
+                    path.unlink(missing_ok=True)